@@ -73,37 +73,37 @@ async def test_ai_fallback_chain():
         
         try:
             # Initialize service with scenario-specific keys
-            discovery_service = URLDiscoveryService(
+            async with URLDiscoveryService(
                 openai_api_key=scenario['openai_key'],
                 cohere_api_key=scenario['cohere_key']
-            )
-            
-            # Check AI status
-            ai_status = discovery_service.get_ai_status()
-            print(f"AI Status: {ai_status}")
-            
-            # Test categorization for each URL
-            for i, result in enumerate(test_results, 1):
-                print(f"\n  Test {i}: {result['url']}")
+            ) as discovery_service:
                 
-                try:
-                    category, confidence, method = await discovery_service._ai_categorize_url_with_fallback(
-                        result, "Example Company"
-                    )
-                    
-                    print(f"    ✅ Category: {category}")
-                    print(f"    ✅ Confidence: {confidence:.2f}")
-                    print(f"    ✅ Method: {method}")
+                # Check AI status
+                ai_status = discovery_service.get_ai_status()
+                print(f"AI Status: {ai_status}")
+                
+                # Test categorization for each URL
+                for i, result in enumerate(test_results, 1):
+                    print(f"\n  Test {i}: {result['url']}")
                     
-                    # Verify expected method
-                    if method == scenario['expected_method']:
-                        print(f"    ✅ Expected method used: {method}")
-                    else:
-                        print(f"    ⚠️ Expected {scenario['expected_method']}, got {method}")
+                    try:
+                        category, confidence, method = await discovery_service._ai_categorize_url_with_fallback(
+                            result, "Example Company"
+                        )
+                        
+                        print(f"    ✅ Category: {category}")
+                        print(f"    ✅ Confidence: {confidence:.2f}")
+                        print(f"    ✅ Method: {method}")
+                        
+                        # Verify expected method
+                        if method == scenario['expected_method']:
+                            print(f"    ✅ Expected method used: {method}")
+                        else:
+                            print(f"    ⚠️ Expected {scenario['expected_method']}, got {method}")
+                            
+                    except Exception as e:
+                        print(f"    ❌ Categorization failed: {e}")
                         
-                except Exception as e:
-                    print(f"    ❌ Categorization failed: {e}")
-                    
         except Exception as e:
             print(f"❌ Scenario setup failed: {e}")
 
@@ -157,23 +157,23 @@ async def test_error_handling():
     print("1. Testing OpenAI quota error handling...")
     
     try:
-        discovery_service = URLDiscoveryService(
+        async with URLDiscoveryService(
             openai_api_key="sk-invalid-key-to-trigger-quota-error",
             cohere_api_key=os.getenv('COHERE_API_KEY')
-        )
-        
-        test_result = {
-            'url': 'https://example.com/pricing',
-            'title': 'Test Pricing Page',
-            'snippet': 'Test pricing information'
-        }
-        
-        category, confidence, method = await discovery_service._ai_categorize_url_with_fallback(
-            test_result, "Test Company"
-        )
-        
-        print(f"✅ Fallback successful: {method} -> {category} ({confidence:.2f})")
-        
+        ) as discovery_service:
+            
+            test_result = {
+                'url': 'https://example.com/pricing',
+                'title': 'Test Pricing Page',
+                'snippet': 'Test pricing information'
+            }
+            
+            category, confidence, method = await discovery_service._ai_categorize_url_with_fallback(
+                test_result, "Test Company"
+            )
+            
+            print(f"✅ Fallback successful: {method} -> {category} ({confidence:.2f})")
+            
     except Exception as e:
         print(f"❌ Error handling test failed: {e}")
 
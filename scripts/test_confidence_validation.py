@@ -59,85 +59,85 @@ async def test_confidence_validation():
         return
     
     # Initialize service
-    service = URLDiscoveryService(
+    async with URLDiscoveryService(
         cohere_api_key=cohere_key,
         openai_api_key=openai_key,
         brave_api_key=os.getenv('BRAVE_API_KEY')
-    )
-    
-    results = {}
-    
-    for company in TEST_COMPANIES:
-        print(f"🔍 Testing: {company['name']}")
-        print(f"   Website: {company['website']}")
-        print(f"   Expected: {company['expected']}")
-        print(f"   Description: {company['description']}")
+    ) as service:
         
-        try:
-            # Test with different confidence thresholds
-            for threshold in [0.3, 0.6, 0.8]:
-                print(f"\n   🎯 Testing with confidence threshold: {threshold}")
-                
-                discovered_urls = await service.discover_competitor_urls(
-                    competitor_name=company['name'],
-                    base_url=company['website'],
-                    search_depth="standard",
-                    categories=['pricing'],  # Just test one category for speed
-                    ranking_llm="cohere",
-                    selection_llm="cohere",
-                    min_confidence_threshold=threshold
-                )
-                
-                if discovered_urls:
-                    url = discovered_urls[0]
-                    overall_confidence = url.get('confidence_score', 0)
-                    brand_confidence = url.get('brand_confidence', 0)
+        results = {}
+        
+        for company in TEST_COMPANIES:
+            print(f"🔍 Testing: {company['name']}")
+            print(f"   Website: {company['website']}")
+            print(f"   Expected: {company['expected']}")
+            print(f"   Description: {company['description']}")
+            
+            try:
+                # Test with different confidence thresholds
+                for threshold in [0.3, 0.6, 0.8]:
+                    print(f"\n   🎯 Testing with confidence threshold: {threshold}")
                     
-                    print(f"      ✅ Found URL: {url.get('url')}")
-                    print(f"      📊 Overall confidence: {overall_confidence:.2f}")
-                    print(f"      🏢 Brand confidence: {brand_confidence:.2f}")
+                    discovered_urls = await service.discover_competitor_urls(
+                        competitor_name=company['name'],
+                        base_url=company['website'],
+                        search_depth="standard",
+                        categories=['pricing'],  # Just test one category for speed
+                        ranking_llm="cohere",
+                        selection_llm="cohere",
+                        min_confidence_threshold=threshold
+                    )
                     
-                    results[f"{company['name']}_threshold_{threshold}"] = {
-                        'success': True,
-                        'confidence': overall_confidence,
-                        'url': url.get('url')
-                    }
-                else:
-                    print(f"      ⚠️ No URLs found (below confidence threshold)")
-                    results[f"{company['name']}_threshold_{threshold}"] = {
-                        'success': False,
-                        'reason': 'Below confidence threshold'
-                    }
+                    if discovered_urls:
+                        url = discovered_urls[0]
+                        overall_confidence = url.get('confidence_score', 0)
+                        brand_confidence = url.get('brand_confidence', 0)
+                        
+                        print(f"      ✅ Found URL: {url.get('url')}")
+                        print(f"      📊 Overall confidence: {overall_confidence:.2f}")
+                        print(f"      🏢 Brand confidence: {brand_confidence:.2f}")
+                        
+                        results[f"{company['name']}_threshold_{threshold}"] = {
+                            'success': True,
+                            'confidence': overall_confidence,
+                            'url': url.get('url')
+                        }
+                    else:
+                        print(f"      ⚠️ No URLs found (below confidence threshold)")
+                        results[f"{company['name']}_threshold_{threshold}"] = {
+                            'success': False,
+                            'reason': 'Below confidence threshold'
+                        }
+            
+            except Exception as e:
+                print(f"   ❌ Error: {e}")
+                results[company['name']] = {'error': str(e)}
+            
+            print()
         
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            results[company['name']] = {'error': str(e)}
+        # Summary
+        print("📊 Confidence Validation Summary")
+        print("===============================")
         
-        print()
-    
-    # Summary
-    print("📊 Confidence Validation Summary")
-    print("===============================")
-    
-    for company in TEST_COMPANIES:
-        print(f"\n{company['name']} ({company['expected']}):")
+        for company in TEST_COMPANIES:
+            print(f"\n{company['name']} ({company['expected']}):")
+            
+            for threshold in [0.3, 0.6, 0.8]:
+                key = f"{company['name']}_threshold_{threshold}"
+                if key in results:
+                    result = results[key]
+                    if result.get('success'):
+                        conf = result['confidence']
+                        status = "✅ PASS" if conf >= threshold else "⚠️ LOW"
+                        print(f"   Threshold {threshold}: {status} (confidence: {conf:.2f})")
+                    else:
+                        print(f"   Threshold {threshold}: ❌ FAIL ({result.get('reason', 'Unknown')})")
         
-        for threshold in [0.3, 0.6, 0.8]:
-            key = f"{company['name']}_threshold_{threshold}"
-            if key in results:
-                result = results[key]
-                if result.get('success'):
-                    conf = result['confidence']
-                    status = "✅ PASS" if conf >= threshold else "⚠️ LOW"
-                    print(f"   Threshold {threshold}: {status} (confidence: {conf:.2f})")
-                else:
-                    print(f"   Threshold {threshold}: ❌ FAIL ({result.get('reason', 'Unknown')})")
-    
-    print("\n💡 Key Insights:")
-    print("   • Well-known companies should pass most confidence thresholds")
-    print("   • Startups may pass lower thresholds but fail higher ones")
-    print("   • Fictional companies should fail validation entirely")
-    print("   • System protects against returning wrong results for unknown companies")
+        print("\n💡 Key Insights:")
+        print("   • Well-known companies should pass most confidence thresholds")
+        print("   • Startups may pass lower thresholds but fail higher ones")
+        print("   • Fictional companies should fail validation entirely")
+        print("   • System protects against returning wrong results for unknown companies")
 
 async def test_brand_recognition_only():
     """Test just the brand recognition validation step."""
@@ -154,33 +154,33 @@ async def test_brand_recognition_only():
         print("❌ No AI API keys found. Skipping brand recognition test")
         return
     
-    service = URLDiscoveryService(
+    async with URLDiscoveryService(
         cohere_api_key=cohere_key,
         openai_api_key=openai_key
-    )
-    
-    for company in TEST_COMPANIES:
-        print(f"🔍 Testing brand recognition: {company['name']}")
+    ) as service:
         
-        try:
-            validation_result = await service._validate_brand_recognition(
-                company['name'], 
-                company['website']
-            )
-            
-            recognized = validation_result['is_recognized']
-            confidence = validation_result['confidence']
-            reason = validation_result['reason']
+        for company in TEST_COMPANIES:
+            print(f"🔍 Testing brand recognition: {company['name']}")
             
-            status = "✅" if recognized else "❌"
-            print(f"   {status} Recognized: {recognized}")
-            print(f"   📊 Confidence: {confidence:.2f}")
-            print(f"   💭 Reason: {reason}")
+            try:
+                validation_result = await service._validate_brand_recognition(
+                    company['name'], 
+                    company['website']
+                )
+                
+                recognized = validation_result['is_recognized']
+                confidence = validation_result['confidence']
+                reason = validation_result['reason']
+                
+                status = "✅" if recognized else "❌"
+                print(f"   {status} Recognized: {recognized}")
+                print(f"   📊 Confidence: {confidence:.2f}")
+                print(f"   💭 Reason: {reason}")
+                
+            except Exception as e:
+                print(f"   ❌ Error: {e}")
             
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        print()
+            print()
 
 async def main():
     """Main test runner."""
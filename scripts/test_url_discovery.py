@@ -257,91 +257,91 @@ async def test_url_discovery_service():
             print("⚠️ No AI API keys - using mock discovery")
             return True
         
-        discovery_service = URLDiscoveryService(
+        async with URLDiscoveryService(
             cohere_api_key=cohere_api_key,
             openai_api_key=openai_api_key,
             google_cse_api_key=os.getenv('GOOGLE_CSE_API_KEY'),
             google_cse_id=os.getenv('GOOGLE_CSE_ID'),
             brave_api_key=os.getenv('BRAVE_API_KEY')
-        )
-        
-        # Categories are now dynamic - no validation needed
-        print(f"📝 Categories will be searched dynamically: {CATEGORIES_TO_SEARCH}")
-        
-        # Test URL discovery for a well-known company
-        test_company = "Cursor"
-        test_website = "https://www.cursor.com"
-        
-        print(f"\n🔍 Discovering URLs for {test_company} ({test_website})...")
-        print(f"   Searching for categories: {CATEGORIES_TO_SEARCH}")
-        print("   🎯 Returns only the BEST URL per category (AI-selected)")
-        print("   📊 Smart batching: 10 URLs/batch, avg confidence threshold 0.7 (max 40)")
-        
-        # This might take a while due to web searches
-        discovered_urls = await discovery_service.discover_competitor_urls(
-            test_company, test_website, categories=CATEGORIES_TO_SEARCH
-        )
-        
-        print("✅ URL Discovery Service working")
-        print("📊 Discovery Results (1 URL per category):")
-        
-        # Display results by category
-        categories_found = {}
-        categories_discovered = set()
-        
-        for url_info in discovered_urls:
-            category = url_info.get('category', 'uncategorized')
-            url = url_info.get('url', '')
-            confidence = url_info.get('confidence_score', 0)
-            method = url_info.get('discovery_method', 'unknown')
-            selection_method = url_info.get('selection_method', 'single_option')
+        ) as discovery_service:
             
-            categories_discovered.add(category)
-            categories_found[category] = url
+            # Categories are now dynamic - no validation needed
+            print(f"📝 Categories will be searched dynamically: {CATEGORIES_TO_SEARCH}")
             
-            print(f"  📄 {category.upper()}: {url}")
-            print(f"     Confidence: {confidence:.2f} | Discovery: {method} | Selection: {selection_method}")
-        
-        print(f"\n📈 Total categories found: {len(categories_found)}")
-        
-        # Check which of our selected categories were found
-        print(f"\n🎯 Selected Categories Analysis:")
-        found_selected = 0
-        for category in CATEGORIES_TO_SEARCH:
-            if category in categories_found:
-                print(f"  ✅ {category}: Found - {categories_found[category]}")
-                found_selected += 1
+            # Test URL discovery for a well-known company
+            test_company = "Cursor"
+            test_website = "https://www.cursor.com"
+            
+            print(f"\n🔍 Discovering URLs for {test_company} ({test_website})...")
+            print(f"   Searching for categories: {CATEGORIES_TO_SEARCH}")
+            print("   🎯 Returns only the BEST URL per category (AI-selected)")
+            print("   📊 Smart batching: 10 URLs/batch, avg confidence threshold 0.7 (max 40)")
+            
+            # This might take a while due to web searches
+            discovered_urls = await discovery_service.discover_competitor_urls(
+                test_company, test_website, categories=CATEGORIES_TO_SEARCH
+            )
+            
+            print("✅ URL Discovery Service working")
+            print("📊 Discovery Results (1 URL per category):")
+            
+            # Display results by category
+            categories_found = {}
+            categories_discovered = set()
+            
+            for url_info in discovered_urls:
+                category = url_info.get('category', 'uncategorized')
+                url = url_info.get('url', '')
+                confidence = url_info.get('confidence_score', 0)
+                method = url_info.get('discovery_method', 'unknown')
+                selection_method = url_info.get('selection_method', 'single_option')
+                
+                categories_discovered.add(category)
+                categories_found[category] = url
+                
+                print(f"  📄 {category.upper()}: {url}")
+                print(f"     Confidence: {confidence:.2f} | Discovery: {method} | Selection: {selection_method}")
+            
+            print(f"\n📈 Total categories found: {len(categories_found)}")
+            
+            # Check which of our selected categories were found
+            print(f"\n🎯 Selected Categories Analysis:")
+            found_selected = 0
+            for category in CATEGORIES_TO_SEARCH:
+                if category in categories_found:
+                    print(f"  ✅ {category}: Found - {categories_found[category]}")
+                    found_selected += 1
+                else:
+                    print(f"  ⚠️ {category}: Not found")
+            
+            success_rate = found_selected / len(CATEGORIES_TO_SEARCH) if CATEGORIES_TO_SEARCH else 1.0
+            print(f"\n📊 Success Rate: {success_rate:.1%} ({found_selected}/{len(CATEGORIES_TO_SEARCH)} selected categories found)")
+            
+            # Validate all discovered categories are predefined
+            invalid_discovered = categories_discovered - set(available_categories)
+            if invalid_discovered:
+                print(f"❌ Invalid categories discovered: {invalid_discovered}")
+                print("   This indicates an issue with category validation in the service")
             else:
-                print(f"  ⚠️ {category}: Not found")
-        
-        success_rate = found_selected / len(CATEGORIES_TO_SEARCH) if CATEGORIES_TO_SEARCH else 1.0
-        print(f"\n📊 Success Rate: {success_rate:.1%} ({found_selected}/{len(CATEGORIES_TO_SEARCH)} selected categories found)")
-        
-        # Validate all discovered categories are predefined
-        invalid_discovered = categories_discovered - set(available_categories)
-        if invalid_discovered:
-            print(f"❌ Invalid categories discovered: {invalid_discovered}")
-            print("   This indicates an issue with category validation in the service")
-        else:
-            print(f"✅ All discovered categories are valid predefined categories")
-        
-        # Verify uniqueness (should be guaranteed now)
-        unique_categories = len(set(url_info.get('category') for url_info in discovered_urls))
-        total_urls = len(discovered_urls)
-        print(f"\n🔍 Uniqueness Check: {unique_categories} unique categories, {total_urls} total URLs")
-        if unique_categories == total_urls:
-            print("  ✅ Perfect: One URL per category as expected")
-        else:
-            print("  ⚠️ Warning: Duplicate categories found")
-        
-        print(f"\n📊 Smart Batching Info:")
-        print(f"  • Batch Size: 10 URLs per batch")
-        print(f"  • Confidence Threshold: 0.7 (stop if avg >= 0.7)")
-        print(f"  • Maximum URLs: 40 total")
-        print(f"  • Early stopping helps reduce AI costs and processing time")
-        
-        return success_rate > 0.3  # Consider success if we find >30% of selected categories
-        
+                print(f"✅ All discovered categories are valid predefined categories")
+            
+            # Verify uniqueness (should be guaranteed now)
+            unique_categories = len(set(url_info.get('category') for url_info in discovered_urls))
+            total_urls = len(discovered_urls)
+            print(f"\n🔍 Uniqueness Check: {unique_categories} unique categories, {total_urls} total URLs")
+            if unique_categories == total_urls:
+                print("  ✅ Perfect: One URL per category as expected")
+            else:
+                print("  ⚠️ Warning: Duplicate categories found")
+            
+            print(f"\n📊 Smart Batching Info:")
+            print(f"  • Batch Size: 10 URLs per batch")
+            print(f"  • Confidence Threshold: 0.7 (stop if avg >= 0.7)")
+            print(f"  • Maximum URLs: 40 total")
+            print(f"  • Early stopping helps reduce AI costs and processing time")
+            
+            return success_rate > 0.3  # Consider success if we find >30% of selected categories
+            
     except Exception as e:
         print(f"❌ URL Discovery Service failed: {e}")
         import traceback
@@ -356,92 +356,92 @@ async def test_real_world_examples():
     print(f"🏷️ Searching for categories: {CATEGORIES_TO_SEARCH}")
     
     # Initialize the service
-    service = URLDiscoveryService(
+    async with URLDiscoveryService(
         openai_api_key=os.getenv('OPENAI_API_KEY'),
         cohere_api_key=os.getenv('COHERE_API_KEY'),
         google_cse_api_key=os.getenv('GOOGLE_CSE_API_KEY'),
         google_cse_id=os.getenv('GOOGLE_CSE_ID'),
         brave_api_key=os.getenv('BRAVE_API_KEY')
-    )
-    
-    print(f"📝 Categories will be dynamically searched: {CATEGORIES_TO_SEARCH}")
-    
-    results_summary = {}
-    
-    for company in TEST_COMPANIES:
-        print(f"\n🔍 Testing: {company['name']} ({company['website']})")
-        print(f"📋 Description: {company['description']}")
-        print(f"🏷️ Looking for categories: {CATEGORIES_TO_SEARCH}")
-        print("🤖 Using Cohere for ranking, Cohere for selection")
+    ) as service:
         
-        try:
-            # Test with different LLM combinations
-            discovered_urls = await service.discover_competitor_urls(
-                competitor_name=company['name'],
-                base_url=company['website'],
-                search_depth="standard",
-                categories=CATEGORIES_TO_SEARCH,
-                ranking_llm="cohere",     # Use Cohere for ranking
-                selection_llm="cohere"    # Use Cohere for selection
-            )
-            
-            print(f"   📊 Found {len(discovered_urls)} URLs (1 per category)")
+        print(f"📝 Categories will be dynamically searched: {CATEGORIES_TO_SEARCH}")
+        
+        results_summary = {}
+        
+        for company in TEST_COMPANIES:
+            print(f"\n🔍 Testing: {company['name']} ({company['website']})")
+            print(f"📋 Description: {company['description']}")
+            print(f"🏷️ Looking for categories: {CATEGORIES_TO_SEARCH}")
+            print("🤖 Using Cohere for ranking, Cohere for selection")
             
-            # Group by category for analysis
-            found_categories = set()
-            for url in discovered_urls:
-                category = url.get('category', 'unknown')
-                found_categories.add(category)
-                ranking_llm = url.get('ranking_llm', 'unknown')
-                selection_llm = url.get('selection_llm', 'unknown')
-                confidence = url.get('confidence_score', 0)
-                discovery_method = url.get('discovery_method', 'unknown')
+            try:
+                # Test with different LLM combinations
+                discovered_urls = await service.discover_competitor_urls(
+                    competitor_name=company['name'],
+                    base_url=company['website'],
+                    search_depth="standard",
+                    categories=CATEGORIES_TO_SEARCH,
+                    ranking_llm="cohere",     # Use Cohere for ranking
+                    selection_llm="cohere"    # Use Cohere for selection
+                )
                 
-                print(f"   📄 {category}: {url.get('url')}")
-                print(f"      Ranking: {ranking_llm} | Selection: {selection_llm} | Confidence: {confidence:.2f}")
-                print(f"      Method: {discovery_method}")
-            
-            # Calculate success metrics
-            print(f"   📂 Categories discovered: {sorted(list(found_categories))}")
-            
-            # Analyze against target categories
-            print(f"   🎯 Target Categories Analysis:")
-            found_target_categories = 0
-            for target_category in CATEGORIES_TO_SEARCH:
-                if target_category in found_categories:
-                    print(f"      ✅ {target_category}: Found")
-                    found_target_categories += 1
-                else:
-                    print(f"      ⚠️ {target_category}: Not found")
-            
-            success_rate = (found_target_categories / len(CATEGORIES_TO_SEARCH)) * 100
-            print(f"   📈 Success rate: {success_rate:.1f}% ({found_target_categories}/{len(CATEGORIES_TO_SEARCH)} target categories)")
-            
-            # Quality checks
-            print(f"   ✅ All discovered categories match search criteria")
-            print(f"   ✅ Uniqueness: Perfect (1 URL per category)")
-            print(f"   📊 Simplified Workflow Benefits:")
-            print(f"      • Cleaner logic with implicit categorization from search")
-            print(f"      • Flexible LLM selection for ranking and selection steps")
-            print(f"      • High-quality results with LLM-driven relevance ranking")
-            
-            results_summary[company['name']] = success_rate
-            
-        except Exception as e:
-            print(f"   ❌ Error testing {company['name']}: {e}")
-            results_summary[company['name']] = 0.0
-    
-    # Summary
-    print(f"\n📊 Real-World Discovery Summary:")
-    for company_name, success_rate in results_summary.items():
-        print(f"  {company_name}: {success_rate:.1f}%")
-    
-    overall_success = sum(results_summary.values()) / len(results_summary) if results_summary else 0
-    print(f"  Overall Success Rate: {overall_success:.1f}%")
-    print(f"  Target Categories: {CATEGORIES_TO_SEARCH}")
-    
-    # Return success boolean
-    return overall_success >= 50.0  # Consider success if we find >=50% of target categories
+                print(f"   📊 Found {len(discovered_urls)} URLs (1 per category)")
+                
+                # Group by category for analysis
+                found_categories = set()
+                for url in discovered_urls:
+                    category = url.get('category', 'unknown')
+                    found_categories.add(category)
+                    ranking_llm = url.get('ranking_llm', 'unknown')
+                    selection_llm = url.get('selection_llm', 'unknown')
+                    confidence = url.get('confidence_score', 0)
+                    discovery_method = url.get('discovery_method', 'unknown')
+                    
+                    print(f"   📄 {category}: {url.get('url')}")
+                    print(f"      Ranking: {ranking_llm} | Selection: {selection_llm} | Confidence: {confidence:.2f}")
+                    print(f"      Method: {discovery_method}")
+                
+                # Calculate success metrics
+                print(f"   📂 Categories discovered: {sorted(list(found_categories))}")
+                
+                # Analyze against target categories
+                print(f"   🎯 Target Categories Analysis:")
+                found_target_categories = 0
+                for target_category in CATEGORIES_TO_SEARCH:
+                    if target_category in found_categories:
+                        print(f"      ✅ {target_category}: Found")
+                        found_target_categories += 1
+                    else:
+                        print(f"      ⚠️ {target_category}: Not found")
+                
+                success_rate = (found_target_categories / len(CATEGORIES_TO_SEARCH)) * 100
+                print(f"   📈 Success rate: {success_rate:.1f}% ({found_target_categories}/{len(CATEGORIES_TO_SEARCH)} target categories)")
+                
+                # Quality checks
+                print(f"   ✅ All discovered categories match search criteria")
+                print(f"   ✅ Uniqueness: Perfect (1 URL per category)")
+                print(f"   📊 Simplified Workflow Benefits:")
+                print(f"      • Cleaner logic with implicit categorization from search")
+                print(f"      • Flexible LLM selection for ranking and selection steps")
+                print(f"      • High-quality results with LLM-driven relevance ranking")
+                
+                results_summary[company['name']] = success_rate
+                
+            except Exception as e:
+                print(f"   ❌ Error testing {company['name']}: {e}")
+                results_summary[company['name']] = 0.0
+        
+        # Summary
+        print(f"\n📊 Real-World Discovery Summary:")
+        for company_name, success_rate in results_summary.items():
+            print(f"  {company_name}: {success_rate:.1f}%")
+        
+        overall_success = sum(results_summary.values()) / len(results_summary) if results_summary else 0
+        print(f"  Overall Success Rate: {overall_success:.1f}%")
+        print(f"  Target Categories: {CATEGORIES_TO_SEARCH}")
+        
+        # Return success boolean
+        return overall_success >= 50.0  # Consider success if we find >=50% of target categories
 
 async def test_full_workflow():
     """Test the complete URL discovery and social media workflow"""
@@ -47,74 +47,74 @@ async def test_confidence_validation():
         return
     
     # Initialize service
-    service = URLDiscoveryService(
+    async with URLDiscoveryService(
         cohere_api_key=cohere_key,
         openai_api_key=openai_key,
         brave_api_key=os.getenv('BRAVE_API_KEY')
-    )
-    
-    results = {}
-    
-    print("🔍 Testing different confidence thresholds:")
-    print("-" * 50)
-    
-    for threshold in CONFIDENCE_THRESHOLDS:
-        print(f"\n🎯 **Confidence Threshold: {threshold}**")
-        print(f"   {'LOW' if threshold <= 0.4 else 'MEDIUM' if threshold <= 0.7 else 'HIGH'} confidence requirement")
+    ) as service:
+        
+        results = {}
         
-        try:
-            discovered_urls = await service.discover_competitor_urls(
-                competitor_name=COMPANY_NAME,
-                base_url=BASE_URL,
-                search_depth="standard",
-                categories=CATEGORIES,
-                ranking_llm="cohere",
-                selection_llm="cohere",
-                min_confidence_threshold=threshold
-            )
+        print("🔍 Testing different confidence thresholds:")
+        print("-" * 50)
+        
+        for threshold in CONFIDENCE_THRESHOLDS:
+            print(f"\n🎯 **Confidence Threshold: {threshold}**")
+            print(f"   {'LOW' if threshold <= 0.4 else 'MEDIUM' if threshold <= 0.7 else 'HIGH'} confidence requirement")
             
-            if discovered_urls:
-                print(f"   ✅ **PASSED** - Found {len(discovered_urls)} URLs")
-                for url in discovered_urls:
-                    category = url.get('category', 'unknown')
-                    confidence = url.get('confidence_score', 0)
-                    brand_conf = url.get('brand_confidence', 0)
-                    print(f"      📄 {category}: {url.get('url')}")
-                    print(f"         Overall: {confidence:.2f} | Brand: {brand_conf:.2f}")
+            try:
+                discovered_urls = await service.discover_competitor_urls(
+                    competitor_name=COMPANY_NAME,
+                    base_url=BASE_URL,
+                    search_depth="standard",
+                    categories=CATEGORIES,
+                    ranking_llm="cohere",
+                    selection_llm="cohere",
+                    min_confidence_threshold=threshold
+                )
                 
-                results[threshold] = {
-                    'passed': True,
-                    'count': len(discovered_urls),
-                    'avg_confidence': sum(url.get('confidence_score', 0) for url in discovered_urls) / len(discovered_urls)
-                }
+                if discovered_urls:
+                    print(f"   ✅ **PASSED** - Found {len(discovered_urls)} URLs")
+                    for url in discovered_urls:
+                        category = url.get('category', 'unknown')
+                        confidence = url.get('confidence_score', 0)
+                        brand_conf = url.get('brand_confidence', 0)
+                        print(f"      📄 {category}: {url.get('url')}")
+                        print(f"         Overall: {confidence:.2f} | Brand: {brand_conf:.2f}")
+                    
+                    results[threshold] = {
+                        'passed': True,
+                        'count': len(discovered_urls),
+                        'avg_confidence': sum(url.get('confidence_score', 0) for url in discovered_urls) / len(discovered_urls)
+                    }
+                else:
+                    print(f"   ⚠️ **FILTERED OUT** - No URLs met confidence threshold")
+                    print(f"      This protects against potentially wrong results")
+                    results[threshold] = {'passed': False, 'reason': 'Below confidence threshold'}
+                    
+            except Exception as e:
+                print(f"   ❌ **ERROR**: {e}")
+                results[threshold] = {'passed': False, 'reason': str(e)}
+        
+        # Summary
+        print("\n📊 **Confidence Validation Summary**")
+        print("===================================")
+        
+        for threshold, result in results.items():
+            status = "✅ PASS" if result.get('passed') else "⚠️ FILTER"
+            confidence_level = "LOW" if threshold <= 0.4 else "MEDIUM" if threshold <= 0.7 else "HIGH"
+            
+            print(f"{confidence_level:6} ({threshold}): {status}")
+            if result.get('passed'):
+                print(f"        Found {result['count']} URLs, avg confidence: {result['avg_confidence']:.2f}")
             else:
-                print(f"   ⚠️ **FILTERED OUT** - No URLs met confidence threshold")
-                print(f"      This protects against potentially wrong results")
-                results[threshold] = {'passed': False, 'reason': 'Below confidence threshold'}
-                
-        except Exception as e:
-            print(f"   ❌ **ERROR**: {e}")
-            results[threshold] = {'passed': False, 'reason': str(e)}
-    
-    # Summary
-    print("\n📊 **Confidence Validation Summary**")
-    print("===================================")
-    
-    for threshold, result in results.items():
-        status = "✅ PASS" if result.get('passed') else "⚠️ FILTER"
-        confidence_level = "LOW" if threshold <= 0.4 else "MEDIUM" if threshold <= 0.7 else "HIGH"
+                print(f"        {result.get('reason', 'Unknown')}")
         
-        print(f"{confidence_level:6} ({threshold}): {status}")
-        if result.get('passed'):
-            print(f"        Found {result['count']} URLs, avg confidence: {result['avg_confidence']:.2f}")
-        else:
-            print(f"        {result.get('reason', 'Unknown')}")
-    
-    print("\n💡 **Key Insights:**")
-    print("   • Higher thresholds = fewer but more reliable results")
-    print("   • Lower thresholds = more results but potentially less reliable")
-    print("   • System protects against wrong results for unknown companies")
-    print("   • Better to return no results than completely wrong results")
+        print("\n💡 **Key Insights:**")
+        print("   • Higher thresholds = fewer but more reliable results")
+        print("   • Lower thresholds = more results but potentially less reliable")
+        print("   • System protects against wrong results for unknown companies")
+        print("   • Better to return no results than completely wrong results")
 
 async def test_llm_combinations():
     """Test different LLM combinations for ranking and selection."""
@@ -145,38 +145,38 @@ async def test_llm_combinations():
     elif openai_key:
         combinations = [("openai", "openai", "OpenAI → OpenAI (available)")]
     
-    service = URLDiscoveryService(
+    async with URLDiscoveryService(
         cohere_api_key=cohere_key,
         openai_api_key=openai_key,
         brave_api_key=os.getenv('BRAVE_API_KEY')
-    )
-    
-    for ranking_llm, selection_llm, description in combinations:
-        print(f"🔍 Testing: {description}")
+    ) as service:
         
-        try:
-            discovered_urls = await service.discover_competitor_urls(
-                competitor_name=COMPANY_NAME,
-                base_url=BASE_URL,
-                search_depth="standard",
-                categories=['pricing'],  # Just test one category for speed
-                ranking_llm=ranking_llm,
-                selection_llm=selection_llm,
-                min_confidence_threshold=0.6  # Medium confidence
-            )
+        for ranking_llm, selection_llm, description in combinations:
+            print(f"🔍 Testing: {description}")
             
-            if discovered_urls:
-                url = discovered_urls[0]
-                print(f"   ✅ Found: {url.get('url')}")
-                print(f"   📊 Confidence: {url.get('confidence_score', 0):.2f}")
-                print(f"   🤖 Ranking: {url.get('ranking_llm')} | Selection: {url.get('selection_llm')}")
-            else:
-                print(f"   ⚠️ No results (filtered by confidence validation)")
+            try:
+                discovered_urls = await service.discover_competitor_urls(
+                    competitor_name=COMPANY_NAME,
+                    base_url=BASE_URL,
+                    search_depth="standard",
+                    categories=['pricing'],  # Just test one category for speed
+                    ranking_llm=ranking_llm,
+                    selection_llm=selection_llm,
+                    min_confidence_threshold=0.6  # Medium confidence
+                )
                 
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        print()
+                if discovered_urls:
+                    url = discovered_urls[0]
+                    print(f"   ✅ Found: {url.get('url')}")
+                    print(f"   📊 Confidence: {url.get('confidence_score', 0):.2f}")
+                    print(f"   🤖 Ranking: {url.get('ranking_llm')} | Selection: {url.get('selection_llm')}")
+                else:
+                    print(f"   ⚠️ No results (filtered by confidence validation)")
+                    
+            except Exception as e:
+                print(f"   ❌ Error: {e}")
+            
+            print()
 
 async def main():
     """Main test runner."""
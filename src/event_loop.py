@@ -0,0 +1,13 @@
+import asyncio
+
+# uvloop gives a faster event loop for network-bound Lambda handlers when installed
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a new event loop for a handler invocation, using uvloop when it is available."""
+    return uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
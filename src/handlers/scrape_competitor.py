@@ -15,6 +15,7 @@ import uuid
 from sqlalchemy import select, update
 
 from database import get_session, ensure_connection
+from event_loop import new_event_loop
 from models import Competitor, ScrapeResult, ScrapeJob, CompetitorUrl
 from scrapers.factory import get_scraper_from_env, ScraperFactory
 
@@ -40,6 +41,8 @@ class CompetitorScraper:
         self.scraper_type = scraper_type
         self.config = config or {}
         self.scraper = None
+        # Pages scraped at the same time; each one is a browser page or a ScrapingBee request
+        self.max_concurrent_scrapes = self.config.get('max_concurrent_scrapes', 4)
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -94,6 +97,23 @@ class CompetitorScraper:
             logger.error(f"Scraping failed for {url}: {e}")
             raise
     
+    async def scrape_urls(self, url_records: List[CompetitorUrl], competitor_name: str) -> List[Any]:
+        """
+        Scrape several URLs concurrently, at most max_concurrent_scrapes at a time.
+        
+        Returns one entry per URL record, in order: the scraped data, or the exception raised
+        while scraping it. Results are saved by the caller one by one, since the database
+        session must not be used concurrently.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_scrapes)
+        
+        async def scrape_one(url_record: CompetitorUrl) -> Dict[str, Any]:
+            async with semaphore:
+                logger.info(f"🔍 Scraping {url_record.url_type}: {url_record.url}")
+                return await self.scrape_url(url_record.url, competitor_name)
+        
+        return await asyncio.gather(*(scrape_one(url_record) for url_record in url_records), return_exceptions=True)
+    
     def get_scraper_info(self) -> Dict[str, Any]:
         """Get information about the current scraper"""
         if self.scraper:
@@ -167,13 +187,12 @@ class EnhancedCompetitorScraper(CompetitorScraper):
             failed_scrapes = 0
             
             try:
-                # Scrape each URL
-                for url_record in confirmed_urls:
+                # Scrape all URLs concurrently, then save each result
+                scrape_outcomes = await self.scrape_urls(confirmed_urls, competitor.name)
+                for url_record, scraped_data in zip(confirmed_urls, scrape_outcomes):
                     try:
-                        logger.info(f"🔍 Scraping {url_record.url_type}: {url_record.url}")
-                        
-                        # Perform scraping
-                        scraped_data = await self.scrape_url(url_record.url, competitor.name)
+                        if isinstance(scraped_data, Exception):
+                            raise scraped_data
                         
                         # Save scrape result
                         scrape_result = ScrapeResult(
@@ -339,13 +358,12 @@ class EnhancedCompetitorScraper(CompetitorScraper):
             results = []
             
             try:
-                # Scrape each URL in the category
-                for url_record in category_urls:
+                # Scrape all URLs in the category concurrently, then save each result
+                scrape_outcomes = await self.scrape_urls(category_urls, competitor.name)
+                for url_record, scraped_data in zip(category_urls, scrape_outcomes):
                     try:
-                        logger.info(f"🔍 Scraping {url_record.url}")
-                        
-                        # Perform scraping
-                        scraped_data = await self.scrape_url(url_record.url, competitor.name)
+                        if isinstance(scraped_data, Exception):
+                            raise scraped_data
                         
                         # Save scrape result
                         scrape_result = ScrapeResult(
@@ -662,7 +680,7 @@ def handler(event, context):
             }
     
     # Run async handler
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
     try:
         return loop.run_until_complete(async_handler())
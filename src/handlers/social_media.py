@@ -15,6 +15,7 @@ from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 
 from database import get_session, ensure_connection
+from event_loop import new_event_loop
 from models import Competitor, CompetitorUrl, SocialMediaData
 from services.social_media import SocialMediaFetcher
 
@@ -467,7 +468,7 @@ def handler(event, context):
             }
     
     # Run async handler
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
     try:
         return loop.run_until_complete(async_handler())
@@ -15,6 +15,7 @@ from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 
 from database import get_session, ensure_connection
+from event_loop import new_event_loop
 from models import Competitor, CompetitorUrl
 from services.url_discovery import URLDiscoveryService
 
@@ -63,20 +64,25 @@ async def discover_urls(competitor_id: str) -> Dict[str, Any]:
             google_cse_id = os.getenv('GOOGLE_CSE_ID')
             brave_api_key = os.getenv('BRAVE_API_KEY')
             cohere_api_key = os.getenv('COHERE_API_KEY')
+            openai_model = os.getenv('OPENAI_MODEL')  # Optional override, e.g. gpt-4
             
             discovery_service = URLDiscoveryService(
                 openai_api_key=openai_api_key,
                 google_cse_api_key=google_cse_api_key,
                 google_cse_id=google_cse_id,
                 brave_api_key=brave_api_key,
-                cohere_api_key=cohere_api_key
+                cohere_api_key=cohere_api_key,
+                openai_model=openai_model
             )
             
             # Discover URLs
-            discovered_urls = await discovery_service.discover_competitor_urls(
-                competitor.name,
-                competitor.website
-            )
+            try:
+                discovered_urls = await discovery_service.discover_competitor_urls(
+                    competitor.name,
+                    competitor.website
+                )
+            finally:
+                await discovery_service.aclose()
             
             # Save discovered URLs to database
             saved_urls = {}
@@ -430,7 +436,7 @@ def handler(event, context):
             }
     
     # Run async handler
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
     try:
         return loop.run_until_complete(async_handler())
@@ -6,11 +6,15 @@ All scraper implementations must inherit from this base class.
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 import logging
+import re
 
-from .cohere import get_pricing_and_features_with_cohere
+from .cohere import get_cohere_client, get_pricing_and_features_with_cohere, aget_pricing_and_features_with_cohere
 
 logger = logging.getLogger(__name__)
 
+# First amount in a price string, e.g. "$29.99/month" -> "29.99"
+_PRICE_AMOUNT_RE = re.compile(r'\$?(\d+(?:\.\d{2})?)')
+
 class BaseScraper(ABC):
     """
     Abstract base class for all scraper implementations.
@@ -26,6 +30,8 @@ class BaseScraper(ABC):
         """
         self.config = config or {}
         self.name = self.__class__.__name__
+        # Created on first use and reused for every page this scraper extracts
+        self._cohere_client = None
     
     @abstractmethod
     async def __aenter__(self):
@@ -139,11 +145,10 @@ class BaseScraper(ABC):
                 patterns['annual_prices'].append(price)
             
             # Extract numeric values for range analysis
-            import re
-            numbers = re.findall(r'\$?(\d+(?:\.\d{2})?)', price)
-            if numbers:
+            match = _PRICE_AMOUNT_RE.search(price)
+            if match:
                 try:
-                    value = float(numbers[0])
+                    value = float(match.group(1))
                     if patterns['price_ranges']['lowest'] is None or value < patterns['price_ranges']['lowest']:
                         patterns['price_ranges']['lowest'] = value
                     if patterns['price_ranges']['highest'] is None or value > patterns['price_ranges']['highest']:
@@ -171,5 +176,13 @@ class BaseScraper(ABC):
         else:
             logger.error(f"{log_msg} - Error: {error}") 
 
+    def _get_cohere_client(self):
+        if self._cohere_client is None:
+            self._cohere_client = get_cohere_client()
+        return self._cohere_client
+
     def get_pricing_and_features_with_cohere(self, html_content: str):
-        return get_pricing_and_features_with_cohere(html_content)
\ No newline at end of file
+        return get_pricing_and_features_with_cohere(html_content, self._get_cohere_client())
+
+    async def aget_pricing_and_features_with_cohere(self, html_content: str):
+        return await aget_pricing_and_features_with_cohere(html_content, self._get_cohere_client())
\ No newline at end of file
@@ -17,8 +17,7 @@ def get_cohere_prompt(html_content: str, format: str):
         ("user", "Return the pricing and features in the following JSON format. Do not include any other text or comments. If the currecy does not exist, use null. But you can use the currency symbol from the html content: {format}"),
     ])
 
-def get_pricing_and_features_with_cohere(html_content: str):
-    client = get_cohere_client()
+def get_pricing_and_features_messages(html_content: str):
     format = """
     [
     {
@@ -38,6 +37,15 @@ def get_pricing_and_features_with_cohere(html_content: str):
     """
     prompt = get_cohere_prompt(html_content, format)
     formatted_prompt = prompt.format_prompt(html_content=html_content, format=format)
-    messages = formatted_prompt.to_messages()
-    response = client.invoke(messages)
+    return formatted_prompt.to_messages()
+
+def get_pricing_and_features_with_cohere(html_content: str, client=None):
+    client = client or get_cohere_client()
+    response = client.invoke(get_pricing_and_features_messages(html_content))
+    return response.content
+
+# For scrapers running on the event loop: invoke() would block it for the whole LLM call
+async def aget_pricing_and_features_with_cohere(html_content: str, client=None):
+    client = client or get_cohere_client()
+    response = await client.ainvoke(get_pricing_and_features_messages(html_content))
     return response.content
\ No newline at end of file
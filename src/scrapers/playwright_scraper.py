@@ -169,7 +169,7 @@ class PlaywrightScraper(BaseScraper):
             # Extract pricing and features
             # extracted_data = await self._extract_data(soup, competitor_name, url)
 
-            fetched_data = self.get_pricing_and_features_with_cohere(html_content)
+            fetched_data = await self.aget_pricing_and_features_with_cohere(html_content)
 
             plans_list = json.loads(fetched_data)
    
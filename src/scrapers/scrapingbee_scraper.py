@@ -7,14 +7,99 @@ import asyncio
 import aiohttp
 import logging
 import os
+import re
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
 
 logger = logging.getLogger(__name__)
 
+_DIGITS_RE = re.compile(r'\d+')
+
+# Price element selectors; ScrapingBee provides clean HTML, so these can be precise
+_PRICE_SELECTORS = (
+    # Modern SaaS pricing selectors
+    '[data-testid*="price"]',
+    '[data-price]',
+    '[aria-label*="price"]',
+    
+    # Class-based selectors (common patterns)
+    '[class*="price"]:not([class*="old"]):not([class*="strike"])',
+    '[class*="cost"]',
+    '[class*="pricing"]',
+    '[class*="amount"]',
+    '[class*="rate"]',
+    
+    # Semantic selectors for modern frameworks
+    '.plan-price, .tier-price, .subscription-price',
+    '.price-value, .cost-value, .amount-value',
+    '.monthly-price, .annual-price, .yearly-price',
+    
+    # React/Vue component patterns
+    '[class*="Price"]',  # PascalCase components
+    '[class*="Cost"]',
+    '[class*="Plan"]',
+    
+    # Pricing card patterns
+    '.pricing-card [class*="price"]',
+    '.plan-card [class*="price"]',
+    '.tier-card [class*="price"]',
+    
+    # Table-based pricing
+    'table[class*="pricing"] td',
+    '.pricing-table td'
+)
+
+# Plan/feature container selectors for modern SaaS sites
+_PLAN_SELECTORS = (
+    # Data attribute selectors (preferred for modern sites)
+    '[data-testid*="plan"]',
+    '[data-plan]',
+    '[data-tier]',
+    '[data-package]',
+    
+    # Semantic class selectors
+    '.plan, .tier, .package, .subscription',
+    '.pricing-plan, .pricing-tier, .pricing-package',
+    '.plan-card, .tier-card, .pricing-card',
+    
+    # Feature list selectors
+    '.features, .plan-features, .tier-features',
+    '.feature-list, .benefits, .inclusions',
+    '.plan-benefits, .tier-benefits',
+    
+    # Modern component patterns
+    '[class*="Plan"]',  # React/Vue components
+    '[class*="Tier"]',
+    '[class*="Package"]',
+    
+    # Grid/flex layouts common in modern pricing
+    '.pricing-grid > div',
+    '.plans-grid > div',
+    '.tiers-grid > div'
+)
+
+# Class name words marking a pricing section, checked against every div/section/main on the page
+_PRICING_SECTION_WORDS = ('pricing', 'plans', 'tiers', 'packages', 'subscription', 'cost')
+
+# Keyword tables for the per-element price/plan heuristics, built once instead of on every call
+_CURRENCY_INDICATORS = ('$', '€', '£', '¥', '₹', 'usd', 'eur', 'gbp', 'jpy', 'inr')
+_PRICING_TERMS = (
+    'free', 'trial', 'month', 'year', 'annual', 'monthly', 'yearly',
+    'per user', 'per month', 'per year', '/mo', '/yr', '/month', '/year',
+    'billed', 'starting', 'from', 'price', 'cost'
+)
+_PLAN_KEYWORDS = (
+    'plan', 'tier', 'package', 'subscription', 'edition',
+    'features', 'includes', 'access', 'support', 'users',
+    'storage', 'bandwidth', 'requests', 'api', 'integrations',
+    'unlimited', 'limited', 'custom', 'enterprise', 'professional',
+    'starter', 'basic', 'premium', 'advanced'
+)
+_STRUCTURE_INDICATORS = ('|', '•', '-', '✓', '✗', 'gb', 'tb', '%')
+
 class ScrapingBeeScraper(BaseScraper):
     """
     Premium scraper using ScrapingBee API
@@ -142,16 +227,15 @@ class ScrapingBeeScraper(BaseScraper):
                 spb_country = response.headers.get('spb-country', 'unknown')
                 spb_proxy_type = response.headers.get('spb-proxy-type', 'unknown')
                 
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Extract pricing and features
-                extracted_data = await self._extract_data(soup, competitor_name, url)
+                # Parse and extract pricing and features in a worker thread so concurrent scrapes keep streaming
+                extracted_data, page_title = await asyncio.to_thread(
+                    self._parse_and_extract, html_content, competitor_name, url
+                )
                 
                 # Add metadata_
                 extracted_data['metadata_'] = {
                     'scrape_method': 'scrapingbee',
-                    'page_title': soup.title.string if soup.title else '',
+                    'page_title': page_title,
                     'response_time': response_time,
                     'scraped_at': datetime.now(timezone.utc).isoformat(),
                     'url': url,
@@ -180,7 +264,14 @@ class ScrapingBeeScraper(BaseScraper):
             self.log_scrape_attempt(url, False, response_time, str(e))
             raise
     
-    async def _extract_data(self, soup: BeautifulSoup, competitor_name: str, url: str) -> Dict[str, Any]:
+    def _parse_and_extract(self, html_content: str, competitor_name: str, url: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Parse the page and extract its data in one blocking call, returning (data, page title)
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        return self._extract_data(soup, competitor_name, url), soup.title.string if soup.title else ''
+    
+    def _extract_data(self, soup: BeautifulSoup, competitor_name: str, url: str) -> Dict[str, Any]:
         """
         Enhanced data extraction optimized for ScrapingBee's clean HTML
         """
@@ -190,42 +281,8 @@ class ScrapingBeeScraper(BaseScraper):
             'raw_html_snippet': ''
         }
         
-        # ScrapingBee provides clean HTML, so we can use more precise selectors
-        price_selectors = [
-            # Modern SaaS pricing selectors
-            '[data-testid*="price"]',
-            '[data-price]',
-            '[aria-label*="price"]',
-            
-            # Class-based selectors (common patterns)
-            '[class*="price"]:not([class*="old"]):not([class*="strike"])',
-            '[class*="cost"]',
-            '[class*="pricing"]',
-            '[class*="amount"]',
-            '[class*="rate"]',
-            
-            # Semantic selectors for modern frameworks
-            '.plan-price, .tier-price, .subscription-price',
-            '.price-value, .cost-value, .amount-value',
-            '.monthly-price, .annual-price, .yearly-price',
-            
-            # React/Vue component patterns
-            '[class*="Price"]',  # PascalCase components
-            '[class*="Cost"]',
-            '[class*="Plan"]',
-            
-            # Pricing card patterns
-            '.pricing-card [class*="price"]',
-            '.plan-card [class*="price"]',
-            '.tier-card [class*="price"]',
-            
-            # Table-based pricing
-            'table[class*="pricing"] td',
-            '.pricing-table td'
-        ]
-        
         prices_found = []
-        for selector in price_selectors:
+        for selector in _PRICE_SELECTORS:
             try:
                 elements = soup.select(selector)
                 for element in elements:
@@ -237,36 +294,8 @@ class ScrapingBeeScraper(BaseScraper):
                 continue
         
         # Enhanced plan/feature extraction for modern SaaS sites
-        plan_selectors = [
-            # Data attribute selectors (preferred for modern sites)
-            '[data-testid*="plan"]',
-            '[data-plan]',
-            '[data-tier]',
-            '[data-package]',
-            
-            # Semantic class selectors
-            '.plan, .tier, .package, .subscription',
-            '.pricing-plan, .pricing-tier, .pricing-package',
-            '.plan-card, .tier-card, .pricing-card',
-            
-            # Feature list selectors
-            '.features, .plan-features, .tier-features',
-            '.feature-list, .benefits, .inclusions',
-            '.plan-benefits, .tier-benefits',
-            
-            # Modern component patterns
-            '[class*="Plan"]',  # React/Vue components
-            '[class*="Tier"]',
-            '[class*="Package"]',
-            
-            # Grid/flex layouts common in modern pricing
-            '.pricing-grid > div',
-            '.plans-grid > div',
-            '.tiers-grid > div'
-        ]
-        
         plans_found = []
-        for selector in plan_selectors:
+        for selector in _PLAN_SELECTORS:
             try:
                 elements = soup.select(selector)[:10]  # Limit to prevent spam
                 for element in elements:
@@ -303,76 +332,55 @@ class ScrapingBeeScraper(BaseScraper):
         if not text or len(text) > 150:  # Slightly more generous for clean output
             return False
         
-        text = text.strip().lower()
-        
-        # Currency indicators
-        currency_indicators = ['$', '€', '£', '¥', '₹', 'usd', 'eur', 'gbp', 'jpy', 'inr']
-        has_currency = any(indicator in text for indicator in currency_indicators)
-        
-        # Pricing terms
-        pricing_terms = [
-            'free', 'trial', 'month', 'year', 'annual', 'monthly', 'yearly',
-            'per user', 'per month', 'per year', '/mo', '/yr', '/month', '/year',
-            'billed', 'starting', 'from', 'price', 'cost'
-        ]
-        has_pricing_terms = any(term in text for term in pricing_terms)
+        # Numeric patterns; checked first since most page text has no digits and needs no keyword scan
+        if not _DIGITS_RE.search(text):
+            return False
         
-        # Numeric patterns
-        import re
-        has_numbers = bool(re.search(r'\d+', text))
+        text = text.strip().lower()
         
-        # More sophisticated validation for ScrapingBee's clean output
-        return (has_currency or has_pricing_terms) and has_numbers
+        # Currency indicators or pricing terms
+        return (any(indicator in text for indicator in _CURRENCY_INDICATORS)
+                or any(term in text for term in _PRICING_TERMS))
     
     def _is_likely_plan(self, text: str) -> bool:
         """Check if text looks like a plan description (optimized for clean output)"""
         if not text or len(text) < 15 or len(text) > 3000:
             return False
         
-        # Plan-related keywords
-        plan_keywords = [
-            'plan', 'tier', 'package', 'subscription', 'edition',
-            'features', 'includes', 'access', 'support', 'users',
-            'storage', 'bandwidth', 'requests', 'api', 'integrations',
-            'unlimited', 'limited', 'custom', 'enterprise', 'professional',
-            'starter', 'basic', 'premium', 'advanced'
-        ]
-        
+        # Plan-related keywords; two are enough, so counting stops there
         text_lower = text.lower()
-        keyword_count = sum(1 for keyword in plan_keywords if keyword in text_lower)
-        
-        # Also check for structured data indicators
-        structure_indicators = ['|', '•', '-', '✓', '✗', 'gb', 'tb', '%']
-        has_structure = any(indicator in text for indicator in structure_indicators)
+        keyword_count = 0
+        for keyword in _PLAN_KEYWORDS:
+            if keyword in text_lower:
+                keyword_count += 1
+                if keyword_count >= 2:
+                    return True
         
-        return keyword_count >= 2 or (keyword_count >= 1 and has_structure)
+        # A single keyword also counts with structured data indicators
+        return keyword_count == 1 and any(indicator in text for indicator in _STRUCTURE_INDICATORS)
     
     def _extract_relevant_html(self, soup: BeautifulSoup) -> str:
         """Extract the most relevant HTML snippet for pricing"""
         # ScrapingBee provides clean HTML, so we can be more precise
         
-        # Look for pricing sections with data attributes first
-        pricing_sections = soup.find_all(['div', 'section', 'main'], 
-                                       attrs={'data-testid': lambda x: x and 'pricing' in x.lower()})
+        # Look for pricing sections with data attributes first; only the first match is used,
+        # so find() stops there instead of walking the rest of the page
+        pricing_section = soup.find(['div', 'section', 'main'], 
+                                    attrs={'data-testid': lambda x: x and 'pricing' in x.lower()})
         
-        if not pricing_sections:
+        if pricing_section is None:
             # Fall back to class-based search
-            pricing_sections = soup.find_all(['div', 'section', 'main'], 
-                                           class_=lambda x: x and any(
-                                               word in x.lower() for word in [
-                                                   'pricing', 'plans', 'tiers', 'packages',
-                                                   'subscription', 'cost'
-                                               ]
-                                           ))
+            pricing_section = soup.find(['div', 'section', 'main'], 
+                                        class_=lambda x: x and any(word in x.lower() for word in _PRICING_SECTION_WORDS))
         
-        if pricing_sections:
-            return str(pricing_sections[0])[:8000]  # Larger snippet for clean HTML
+        if pricing_section is not None:
+            return str(pricing_section)[:8000]  # Larger snippet for clean HTML
         
         # Last resort: find any container with pricing content
-        for indicator in ['$', 'pricing', 'plans', 'tier']:
-            elements = soup.find_all(text=lambda text: text and indicator in str(text).lower())
-            if elements:
-                parent = elements[0].parent
+        for indicator in ('$', 'pricing', 'plans', 'tier'):
+            element = soup.find(text=lambda text: text and indicator in str(text).lower())
+            if element is not None:
+                parent = element.parent
                 if parent:
                     # Walk up to find a meaningful container
                     for _ in range(3):  # Max 3 levels up
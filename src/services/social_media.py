@@ -22,6 +22,12 @@ from TikTokApi import TikTokApi
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Account handles in social profile URLs
+_LINKEDIN_COMPANY_RE = re.compile(r'linkedin\.com/company/([^/]+)')
+_TWITTER_USERNAME_RE = re.compile(r'(?:twitter\.com|x\.com)/([^/]+)')
+_INSTAGRAM_USERNAME_RE = re.compile(r'instagram\.com/([^/]+)')
+_TIKTOK_USERNAME_RE = re.compile(r'tiktok\.com/@([^/]+)')
+
 class SocialMediaFetcher:
     """
     Unified social media data fetcher supporting multiple platforms
@@ -469,7 +475,7 @@ class SocialMediaFetcher:
     def _extract_linkedin_company_id(self, url: str) -> str:
         """Extract LinkedIn company ID from URL"""
         # Pattern: https://www.linkedin.com/company/company-name/
-        match = re.search(r'linkedin\.com/company/([^/]+)', url)
+        match = _LINKEDIN_COMPANY_RE.search(url)
         if match:
             return match.group(1)
         raise ValueError(f"Could not extract LinkedIn company ID from {url}")
@@ -477,7 +483,7 @@ class SocialMediaFetcher:
     def _extract_twitter_username(self, url: str) -> str:
         """Extract Twitter username from URL"""
         # Pattern: https://twitter.com/username or https://x.com/username
-        match = re.search(r'(?:twitter\.com|x\.com)/([^/]+)', url)
+        match = _TWITTER_USERNAME_RE.search(url)
         if match:
             return match.group(1)
         raise ValueError(f"Could not extract Twitter username from {url}")
@@ -485,7 +491,7 @@ class SocialMediaFetcher:
     def _extract_instagram_username(self, url: str) -> str:
         """Extract Instagram username from URL"""
         # Pattern: https://www.instagram.com/username/
-        match = re.search(r'instagram\.com/([^/]+)', url)
+        match = _INSTAGRAM_USERNAME_RE.search(url)
         if match:
             return match.group(1)
         raise ValueError(f"Could not extract Instagram username from {url}")
@@ -493,7 +499,7 @@ class SocialMediaFetcher:
     def _extract_tiktok_username(self, url: str) -> str:
         """Extract TikTok username from URL"""
         # Pattern: https://www.tiktok.com/@username
-        match = re.search(r'tiktok\.com/@([^/]+)', url)
+        match = _TIKTOK_USERNAME_RE.search(url)
         if match:
             return match.group(1)
         raise ValueError(f"Could not extract TikTok username from {url}")
@@ -5,31 +5,36 @@ Automatically discovers pricing, features, blog, and social media URLs.
 
 import logging
 import asyncio
+import contextlib
+import contextvars
+import functools
+import hashlib
+import heapq
+import html
+import itertools
+import json
+import math
 import re
-from typing import Dict, List, Any, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+import time
+from typing import Dict, List, Any, Awaitable, Callable, FrozenSet, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode
 import validators
 import aiohttp
-from bs4 import BeautifulSoup
 
 # LangChain imports
-from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI, RateLimitError
 from langchain.schema import HumanMessage, SystemMessage
 from langchain.prompts import PromptTemplate
 
 # Sitemap parsing
 import advertools as adv
 
-# Additional imports for Google Custom Search and Brave Search
-import json
-from typing import List, Dict, Any, Optional, Union
-import aiohttp
-import asyncio
-import logging
-import re
-from urllib.parse import urljoin, urlparse
-import validators
-from bs4 import BeautifulSoup
+# orjson parses the larger search API payloads several times faster than the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Cohere imports for fallback AI
 try:
@@ -43,6 +48,322 @@ except ImportError:
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Ranking/selection answers are a few short lines, so a small fast model is sufficient by default
+_DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
+
+# <title> is expected near the top of the document, so only the head of the body is read
+_TITLE_SCAN_BYTES = 16384
+_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+# Host part of the first http(s) URL embedded in a search query
+_DOMAIN_RE = re.compile(r'https?://([^/]+)')
+
+# "KEY: value" lines of a structured LLM response (RECOGNIZED, VALID, RANKING, SELECTION, CONFIDENCE, REASON)
+_RESPONSE_FIELD_RE = re.compile(r'^[ \t]*([A-Z_]+):(.*)$', re.MULTILINE)
+
+# URL numbers in a "RANKING: 3, 1, 2" response line
+_INT_RE = re.compile(r'\d+')
+
+# Numeric value of a "CONFIDENCE: 0.85" response line
+_CONFIDENCE_RE = re.compile(r'\d*\.?\d+')
+
+# Domain list parsing: leading bullets/numbering of an LLM answer line, a plausible domain
+# name, and the separators used to split a brand name into words
+_LIST_BULLET_RE = re.compile(r'^[-•*]\s*')
+_LIST_NUMBER_RE = re.compile(r'^\d+\.\s*')
+_DOMAIN_FORMAT_RE = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.([a-zA-Z]{2,}|[a-zA-Z]{2,}\.[a-zA-Z]{2,})$')
+_NAME_SEPARATOR_RE = re.compile(r'[\s\-_]')
+
+# Query parameters that only track the visit; URLs differing only in these are the same page.
+# A bare 'ref' is left alone since some sites use it to select content (e.g. a docs branch or tag).
+_TRACKING_PARAMS = frozenset(('gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref_src', '_ga', '_gl'))
+_TRACKING_PARAM_PREFIXES = ('utm_',)
+
+# Host prefixes of mirrors serving the same pages as the bare domain (desktop www, mobile m)
+_MIRROR_HOST_PREFIXES = ('www.', 'm.')
+
+# Shared system prompt for URL ranking and selection. It is identical for every call and is sent
+# first, so providers that cache prompt prefixes can reuse it; per-call values go at the end.
+_URL_JUDGE_SYSTEM_PROMPT = """You help with competitive analysis by judging which of a company's web pages best cover a category of information (for example pricing, features or blog).
+
+When judging URLs, consider:
+- URL path relevance (e.g., /pricing for the pricing category)
+- Title relevance to the category
+- Description relevance to the category
+- Whether the page is the most direct, official, comprehensive and up-to-date source for the category
+- Overall value for competitive analysis
+
+URLs are given as numbered lists; always refer to URLs by their number.
+Answer only in the exact format requested."""
+
+# Prompt templates for URL ranking and selection, built once and filled per call with str.format
+_BATCH_RANK_PROMPT = """Rank URLs by relevance for each category below; each category has its own numbered list of URLs, so rank each list separately.
+
+Respond with ONLY a JSON object keyed by category name. Each value must be:
+{{"ranking": [URL numbers in order, at most {limit}], "selection": number of the single best URL,
+  "confidence": 0.0-1.0, "reason": "brief explanation"}}
+The selection is the most direct, official and up-to-date page for competitive analysis of that category.
+If none of a category's URLs are relevant, use an empty ranking and a null selection for it.
+
+Example response:
+{{"pricing": {{"ranking": [3, 7, 1], "selection": 3, "confidence": 0.8, "reason": "Official pricing pages"}},
+  "blog": {{"ranking": [], "selection": null, "confidence": 0.0, "reason": "No blog URLs found"}}}}
+
+Company: {competitor_name}
+
+{categories_text}
+"""
+
+_RANK_PROMPT = """Rank the URLs below from most relevant to least relevant for the category.
+
+IMPORTANT: If none of the URLs seem relevant to the category for the company,
+respond with "NO_RELEVANT_URLS" instead of ranking.
+
+If URLs are relevant, respond with the top {limit} most relevant URLs in order:
+RANKING: [URL numbers in order]
+CONFIDENCE: [0.0-1.0 confidence in the ranking]
+REASON: [Brief explanation]
+
+Example response:
+RANKING: 3,7,1,5
+CONFIDENCE: 0.8
+REASON: URLs clearly related to pricing with official domain
+
+Company: {competitor_name}
+Category: {category}
+
+URLs to rank:
+{urls_text}
+"""
+
+_SELECT_PROMPT = """Select the single URL below that would be most valuable for competitive analysis of the company in the category.
+
+Respond with ONLY a JSON object:
+{{"selection": URL number, "confidence": 0.0-1.0, "reason": "brief explanation why this URL is best"}}
+IMPORTANT: If none of the URLs seem appropriate for the category, use null as the selection.
+
+Example response:
+{{"selection": 2, "confidence": 0.9, "reason": "Official pricing page with comprehensive plan details"}}
+
+Company: {competitor_name}
+Category: {category}
+
+Your options:
+{options_text}
+"""
+
+_BATCH_SELECT_PROMPT = """Select the single best URL for each category below; each category has its own numbered list of URLs, so choose only from that category's list.
+
+Respond with ONLY a JSON object keyed by category name. Each value must be:
+{{"selection": URL number, "confidence": 0.0-1.0, "reason": "brief explanation"}}
+If none of a category's URLs are suitable, use null as its selection.
+
+Example response:
+{{"pricing": {{"selection": 2, "confidence": 0.9, "reason": "Official pricing page with plan details"}},
+  "blog": {{"selection": null, "confidence": 0.0, "reason": "No blog URLs found"}}}}
+
+Company: {competitor_name}
+
+{categories_text}
+"""
+
+# Prompt templates for brand and domain validation, static instructions first and per-call values last
+_BRAND_RECOGNITION_PROMPT = """Evaluate if the company below is a well-known, legitimate company or brand.
+
+Consider:
+- Is this a real company/product that exists?
+- Is it well-known enough to have reliable search results?
+- Would search engines return accurate information about this brand?
+- Is the website domain consistent with the company name?
+
+Respond with:
+RECOGNIZED: [YES/NO]
+CONFIDENCE: [0.0-1.0]
+REASON: [Brief explanation]
+
+Example responses:
+RECOGNIZED: YES
+CONFIDENCE: 0.9
+REASON: Well-known productivity software company
+
+RECOGNIZED: NO
+CONFIDENCE: 0.2
+REASON: Unknown company name, may be startup or fictional
+
+Company: "{competitor_name}"
+Website: {base_url}
+"""
+
+_DOMAIN_VALIDATION_PROMPT = """Validate if the discovered domains below are actually related to the company.
+
+Are these domains legitimate and related to the company?
+
+Respond with:
+VALID: [YES/NO]
+CONFIDENCE: [0.0-1.0]
+REASON: [Brief explanation]
+
+Company: "{competitor_name}"
+Discovered domains: {domains}
+Expected base domain: {base_domain}
+"""
+
+_DOMAIN_DISCOVERY_PROMPT = """List the 3 MOST IMPORTANT official domains for the company below, ordered by importance and usage.
+
+I need the TOP 3 most commonly used official domains for web search purposes. Prioritize:
+1. Main website domain (most traffic)
+2. Primary alternative domain (if exists)
+3. Most important subdomain or product domain
+
+Only return the 3 most important domains, ordered from most to least important. Do not include:
+- Social media platforms
+- Third-party review sites
+- Partner websites
+- Regional variations unless they're primary
+
+Format: Return exactly 3 domains, one per line, in order of importance.
+
+Example format:
+notion.so
+notion.com
+api.notion.com
+
+Company: {competitor_name}
+Known domain: {base_domain}"""
+
+# Search snippets are cut to this length in LLM prompts; the start carries the useful context
+_SNIPPET_PROMPT_CHARS = 200
+
+# Answer token budgets for the batch JSON calls: each category entry carries a ranking and/or
+# selection, a confidence and a reason, plus a fixed allowance for the enclosing object
+_BATCH_RANK_TOKENS_PER_CATEGORY = 150
+_BATCH_SELECT_TOKENS_PER_CATEGORY = 100
+_BATCH_TOKENS_OVERHEAD = 50
+
+# Ranking/selection/validation answers for an identical prompt are reused for a day
+_LLM_CACHE_TTL = 86400
+
+# Validated brand domains per (competitor, base domain). Kept at module level so warm Lambda
+# containers reuse them across invocations; stale entries are served while being revalidated.
+# Bounded like the per-service response cache, evicting the least recently used brand when full.
+_BRAND_DOMAIN_CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+_BRAND_DOMAIN_CACHE_MAX_SIZE = 512
+_BRAND_DOMAIN_FRESH_TTL = 86400
+_BRAND_DOMAIN_STALE_TTL = 7 * 86400
+
+# Retry policy for rate-limited (429) or failing (5xx) search API responses
+_SEARCH_MAX_ATTEMPTS = 3
+_MAX_RETRY_DELAY = 8.0
+
+# Search backends used per query, in priority order, and how long the preferred backend's request
+# may be in flight before the next one is queried in parallel (first non-empty answer wins)
+_SEARCH_BACKENDS = ('google_custom_search', 'brave_search_api')
+_SEARCH_HEDGE_DELAY = 2.0
+
+# Set by _search_query in each backend task; _search_slot signals it once the request leaves the
+# rate gate, so time queued locally is not mistaken for a slow backend
+_SEARCH_REQUEST_STARTED: contextvars.ContextVar[Optional[asyncio.Event]] = contextvars.ContextVar(
+    '_SEARCH_REQUEST_STARTED', default=None
+)
+
+# Per-backend concurrency and minimum spacing between requests, kept under each API's rate limit
+# (Google CSE allows about 10 queries/second, Brave's free plan 1 query/second)
+_SEARCH_BACKEND_LIMITS = {
+    'google_custom_search': {'max_concurrent': 8, 'min_interval': 0.1},
+    'brave_search_api': {'max_concurrent': 1, 'min_interval': 1.0},
+}
+
+# Per-provider LLM concurrency and minimum spacing between requests, kept under the default
+# per-minute request limits (about 500 RPM for both gpt-4o-mini tier 1 and Cohere production keys)
+_LLM_PROVIDER_LIMITS = {
+    'openai': {'max_concurrent': 8, 'min_interval': 0.1},
+    'cohere': {'max_concurrent': 4, 'min_interval': 0.12},
+}
+
+# Confidence assigned when a same-domain URL's path is exactly the category slug (e.g. /pricing),
+# or ends in the slug or one of its curated page aliases (e.g. /en/pricing, /product/plans)
+_PATTERN_MATCH_CONFIDENCE = 0.9
+_PATTERN_SEGMENT_CONFIDENCE = 0.8
+
+# Upper bound on search API calls per category (each query costs Google/Brave quota)
+_MAX_QUERIES_PER_CATEGORY = 4
+
+# With this few same-domain candidates, a clear local keyword winner is taken without the LLM.
+# Its confidence sits below the path pattern matches since the match is only a keyword hit.
+_LOCAL_SELECTION_MAX_CANDIDATES = 3
+_LOCAL_SELECTION_CONFIDENCE = 0.7
+
+# Alternative search terms per category, used for comprehensive-depth queries
+_CATEGORY_VARIATIONS = {
+    'pricing': ('price', 'cost', 'plans', 'subscription'),
+    'features': ('product', 'capabilities', 'functionality'),
+    'about': ('company', 'team', 'story'),
+    'contact': ('support', 'help', 'customer-service'),
+    'blog': ('news', 'articles', 'insights'),
+    'careers': ('jobs', 'hiring', 'work'),
+    'docs': ('documentation', 'api', 'developer'),
+    'social': ('twitter', 'linkedin', 'facebook')
+}
+
+# Separators between words within a URL path segment (e.g. how-it-works, case_studies, pricing.html)
+_PATH_WORD_SEPARATOR_RE = re.compile(r'[-_.]')
+
+# Final path segments that name a category's canonical page outright (besides the slug itself);
+# looser variations such as 'work' or 'api' are left to ranking/selection
+_CATEGORY_PAGE_ALIASES = {
+    'pricing': ('plans', 'prices'),
+    'features': ('feature',),
+    'about': ('about-us', 'company'),
+    'contact': ('contact-us',),
+    'careers': ('jobs',),
+    'docs': ('documentation',),
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _url_host(url: str) -> str:
+    """Lowercased host of a URL without the www. prefix ('' if the URL cannot be parsed)."""
+    try:
+        return urlparse(url).netloc.lower().removeprefix('www.')
+    except ValueError:
+        return ''
+
+
+@functools.lru_cache(maxsize=4096)
+def _url_path(url: str) -> str:
+    """Path of a URL ('' if the URL cannot be parsed); shared by scoring and pattern matching across categories."""
+    try:
+        return urlparse(url).path
+    except ValueError:
+        return ''
+
+
+@functools.lru_cache(maxsize=4096)
+def _url_path_tokens(url: str) -> FrozenSet[str]:
+    """Lowercased path segments of a URL plus their words (e.g. /en/how-it-works -> en, how-it-works, how, it, works)."""
+    tokens = set()
+    for segment in _url_path(url).lower().split('/'):
+        if segment:
+            tokens.add(segment)
+            tokens.update(word for word in _PATH_WORD_SEPARATOR_RE.split(segment) if word)
+    return frozenset(tokens)
+
+
+@functools.lru_cache(maxsize=256)
+def _category_slug(category: str) -> str:
+    """Key of a user-supplied category in _CATEGORY_VARIATIONS/_CATEGORY_PAGE_ALIASES (e.g. ' Case Studies' -> 'case-studies')."""
+    return category.lower().strip().replace(' ', '-')
+
+
+@functools.lru_cache(maxsize=256)
+def _category_keywords(category: str) -> FrozenSet[str]:
+    """Lowercased category name, slug and variations matched as whole words/path segments by local scoring."""
+    slug = _category_slug(category)
+    return frozenset((category.lower().strip(), slug) + _CATEGORY_VARIATIONS.get(slug, ()))
+
+
 class URLDiscoveryService:
     """
     Enhanced URL Discovery Service with Google Custom Search and Brave Search.
@@ -95,9 +416,11 @@ class URLDiscoveryService:
                  google_cse_api_key: Optional[str] = None,
                  google_cse_id: Optional[str] = None,
                  brave_api_key: Optional[str] = None,
-                 cohere_api_key: Optional[str] = None):
+                 cohere_api_key: Optional[str] = None,
+                 openai_model: Optional[str] = None):
         """Initialize the URL discovery service with reliable search options."""
         self.openai_api_key = openai_api_key
+        self.openai_model = openai_model or _DEFAULT_OPENAI_MODEL
         self.google_cse_api_key = google_cse_api_key
         self.google_cse_id = google_cse_id
         self.brave_api_key = brave_api_key
@@ -105,14 +428,15 @@ class URLDiscoveryService:
         
         # Initialize LLM if OpenAI key provided
         if openai_api_key:
-            self.llm = ChatOpenAI(
-                model="gpt-4",
+            # Single async client for all completions (reuses its HTTP connection pool)
+            self.openai_client = AsyncOpenAI(
                 api_key=openai_api_key,
-                temperature=0.3
+                max_retries=1,
+                timeout=15.0
             )
-            logger.info("✅ OpenAI GPT-4 initialized for AI categorization")
+            logger.info(f"✅ OpenAI {self.openai_model} initialized for AI categorization")
         else:
-            self.llm = None
+            self.openai_client = None
             logger.info("⚠️ No OpenAI API key provided")
             
         # Initialize Cohere as fallback
@@ -129,8 +453,43 @@ class URLDiscoveryService:
         self.search_tools = []
         self._init_search_tools()
         
-        # Request session with timeout and retry logic
+        # Request session with timeout and retry logic; one session (and connection pool) is
+        # shared by all search and page requests and released by aclose()
         self.session_timeout = aiohttp.ClientTimeout(total=15, connect=5)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Maximum number of concurrent LLM calls, shared by every fan-out in this service
+        self.max_concurrent_llm_calls = 8
+        self._llm_semaphore = asyncio.Semaphore(self.max_concurrent_llm_calls)
+        
+        # Maximum number of concurrent search API requests across all categories and queries
+        self.max_concurrent_searches = 5
+        self._search_semaphore = asyncio.Semaphore(self.max_concurrent_searches)
+        
+        # Per-backend request gates: a concurrency limit plus the earliest time the next request may start
+        self._search_limits = self._new_rate_gates(_SEARCH_BACKEND_LIMITS)
+        
+        # The same gates per LLM provider, taken inside the shared _llm_semaphore
+        self._llm_limits = self._new_rate_gates(_LLM_PROVIDER_LIMITS)
+        
+        # In-flight background refreshes of stale brand domain results, by cache key
+        self._revalidations: Dict[Tuple[str, str], asyncio.Task] = {}
+        
+        # TTL-bounded cache for page titles, search backend and LLM responses
+        self._response_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._response_cache_max_size = 2048
+        self._cache_stats = {'hits': 0, 'misses': 0}
+        
+        # In-flight LLM requests by prompt cache key, shared by concurrent identical prompts
+        self._inflight_llm_calls: Dict[Tuple, asyncio.Future] = {}
+        
+        # Compiled keyword alternations per category for local relevance scoring
+        self._keyword_patterns: Dict[str, re.Pattern] = {}
+        
+        # Local relevance scores by (category, url, title, snippet) for the current discovery run
+        # (cleared at its start); candidates trimmed for the batch ranking are trimmed again by the
+        # per-category fallback when the batch misses
+        self._relevance_scores: Dict[Tuple[str, str, str, str], float] = {}
         
         logger.info("🏷️ Categories will be provided dynamically from user selection or database")
 
@@ -169,10 +528,95 @@ class URLDiscoveryService:
         
         logger.info(f"🔧 Initialized {len(self.search_tools)} search backends")
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it inside the running event loop on first use."""
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+        return self._session
+
+    async def aclose(self):
+        """Release the shared HTTP session and LLM client connections."""
+        await self._finish_revalidations()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self.openai_client:
+            await self.openai_client.close()
+
+    async def __aenter__(self):
+        """Use the service as an async context manager that calls aclose() on exit."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Release connections on leaving the context."""
+        await self.aclose()
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create an HTTP session with per-host connection limits and DNS caching."""
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=32,  # Avoid head-of-line blocking against a single search API or competitor host
+            ttl_dns_cache=300,  # Search APIs and competitor hosts are resolved repeatedly
+            use_dns_cache=True,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(timeout=self.session_timeout, connector=connector)
+
+    def _cache_get(self, key: Tuple) -> Optional[Any]:
+        """Return a cached value if present and not expired, otherwise None."""
+        entry = self._response_cache.pop(key, None)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                # Re-inserting moves the entry to the end, so eviction drops the least recently used one
+                self._response_cache[key] = entry
+                self._cache_stats['hits'] += 1
+                return value
+        self._cache_stats['misses'] += 1
+        return None
+
+    def _cache_set(self, key: Tuple, value: Any, ttl: float):
+        """Store a value with a TTL, evicting the least recently used entry when the cache is full."""
+        if key not in self._response_cache and len(self._response_cache) >= self._response_cache_max_size:
+            # Dicts preserve insertion order and hits re-insert, so the first key is the least recently used
+            del self._response_cache[next(iter(self._response_cache))]
+        self._response_cache[key] = (time.monotonic() + ttl, value)
+
+    def _get_retry_delay(self, response: aiohttp.ClientResponse, attempt: int) -> Optional[float]:
+        """
+        Return how long to wait before retrying a search request, or None if it should not be retried.
+        
+        Only 429 and 5xx responses are retried, using Retry-After / X-RateLimit-Reset when
+        present and exponential backoff otherwise. Waits longer than _MAX_RETRY_DELAY are not
+        retried so the caller can move on to the next search backend instead.
+        """
+        if attempt + 1 >= _SEARCH_MAX_ATTEMPTS:
+            return None
+        if response.status != 429 and response.status < 500:
+            return None
+        
+        delay = float(2 ** attempt)
+        # Brave sends a comma-separated X-RateLimit-Reset (seconds per rate-limit window)
+        header = response.headers.get('Retry-After') or response.headers.get('X-RateLimit-Reset')
+        if header:
+            try:
+                delay = float(header.split(',')[0].strip())
+            except ValueError:
+                pass
+        
+        return delay if delay <= _MAX_RETRY_DELAY else None
+
     async def _google_custom_search(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
         """Google Custom Search API implementation."""
         if not self.google_cse_api_key or not self.google_cse_id:
             raise ValueError("Google Custom Search credentials not configured")
+        
+        cache_key = ('google_custom_search', query, num_results)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"♻️ Google Custom Search cache hit for '{query}'")
+            return list(cached)
             
         url = "https://www.googleapis.com/customsearch/v1"
         params = {
@@ -182,13 +626,14 @@ class URLDiscoveryService:
             'num': min(num_results, 10)  # Google CSE max is 10 per request
         }
         
-        async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
-            try:
-                async with session.get(url, params=params) as response:
+        session = await self._get_session()
+        try:
+            for attempt in range(_SEARCH_MAX_ATTEMPTS):
+                async with self._search_slot('google_custom_search'), session.get(url, params=params) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await response.json(loads=_json_loads)
                         results = []
-                        
+                            
                         for item in data.get('items', []):
                             results.append({
                                 'title': item.get('title', ''),
@@ -196,28 +641,39 @@ class URLDiscoveryService:
                                 'snippet': item.get('snippet', ''),
                                 'source': 'google_custom_search'
                             })
-                        
+                            
                         logger.info(f"✅ Google Custom Search: {len(results)} results for '{query}'")
-                        return results
-                    
-                    elif response.status == 429:
-                        logger.warning("⚠️ Google Custom Search rate limit exceeded")
-                        raise Exception("Rate limit exceeded")
-                    else:
+                        self._cache_set(cache_key, results, ttl=900)
+                        return list(results)
+                        
+                    retry_delay = self._get_retry_delay(response, attempt)
+                    if retry_delay is None:
+                        if response.status == 429:
+                            logger.warning("⚠️ Google Custom Search rate limit exceeded")
+                            raise Exception("Rate limit exceeded")
                         logger.error(f"❌ Google Custom Search error: {response.status}")
                         raise Exception(f"Search failed with status {response.status}")
+                    
+                logger.warning(f"⚠️ Google Custom Search returned {response.status}, retrying in {retry_delay:.1f}s")
+                await asyncio.sleep(retry_delay)
                         
-            except asyncio.TimeoutError:
-                logger.error("⏰ Google Custom Search timeout")
-                raise Exception("Search timeout")
-            except Exception as e:
-                logger.error(f"❌ Google Custom Search error: {e}")
-                raise
+        except asyncio.TimeoutError:
+            logger.error("⏰ Google Custom Search timeout")
+            raise Exception("Search timeout")
+        except Exception as e:
+            logger.error(f"❌ Google Custom Search error: {e}")
+            raise
 
     async def _brave_search_api(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
         """Brave Search API implementation."""
         if not self.brave_api_key:
             raise ValueError("Brave Search API key not configured")
+        
+        cache_key = ('brave_search_api', query, num_results)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"♻️ Brave Search API cache hit for '{query}'")
+            return list(cached)
             
         url = "https://api.search.brave.com/res/v1/web/search"
         headers = {
@@ -229,13 +685,15 @@ class URLDiscoveryService:
             'count': min(num_results, 10)  # Brave API max per request
         }
         
-        async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
-            try:
-                async with session.get(url, headers=headers, params=params) as response:
+        session = await self._get_session()
+        try:
+            for attempt in range(_SEARCH_MAX_ATTEMPTS):
+                async with self._search_slot('brave_search_api'), \
+                        session.get(url, headers=headers, params=params) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await response.json(loads=_json_loads)
                         results = []
-                        
+                            
                         for item in data.get('web', {}).get('results', []):
                             results.append({
                                 'title': item.get('title', ''),
@@ -243,32 +701,42 @@ class URLDiscoveryService:
                                 'snippet': item.get('description', ''),
                                 'source': 'brave_search_api'
                             })
-                        
+                            
                         logger.info(f"✅ Brave Search API: {len(results)} results for '{query}'")
-                        return results
-                    
-                    elif response.status == 429:
-                        logger.warning("⚠️ Brave Search API rate limit exceeded")
-                        raise Exception("Rate limit exceeded")
-                    else:
+                        self._cache_set(cache_key, results, ttl=900)
+                        return list(results)
+                        
+                    retry_delay = self._get_retry_delay(response, attempt)
+                    if retry_delay is None:
+                        if response.status == 429:
+                            logger.warning("⚠️ Brave Search API rate limit exceeded")
+                            raise Exception("Rate limit exceeded")
                         logger.error(f"❌ Brave Search API error: {response.status}")
                         raise Exception(f"Search failed with status {response.status}")
+                    
+                logger.warning(f"⚠️ Brave Search API returned {response.status}, retrying in {retry_delay:.1f}s")
+                await asyncio.sleep(retry_delay)
                         
-            except asyncio.TimeoutError:
-                logger.error("⏰ Brave Search API timeout")
-                raise Exception("Search timeout")
-            except Exception as e:
-                logger.error(f"❌ Brave Search API error: {e}")
-                raise
+        except asyncio.TimeoutError:
+            logger.error("⏰ Brave Search API timeout")
+            raise Exception("Search timeout")
+        except Exception as e:
+            logger.error(f"❌ Brave Search API error: {e}")
+            raise
 
     async def _sitemap_fallback_search(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
         """Fallback search using sitemap analysis and common URL patterns."""
         results = []
         
-        # Extract domain from query if it contains a URL
-        domain_match = re.search(r'https?://([^/]+)', query)
-        if domain_match:
-            domain = domain_match.group(1)
+        # Extract domain from query if it contains a URL (urlparse is enough when the query is a bare URL)
+        parsed = urlparse(query.strip())
+        if parsed.scheme in ('http', 'https') and parsed.netloc:
+            domain = parsed.netloc
+        else:
+            domain_match = _DOMAIN_RE.search(query)
+            domain = domain_match.group(1) if domain_match else None
+        
+        if domain:
             base_url = f"https://{domain}"
             
             # Common URL patterns for competitive intelligence
@@ -283,40 +751,73 @@ class URLDiscoveryService:
                 f"{base_url}/team"
             ]
             
-            # Check which URLs exist
-            async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
-                for url in patterns:
-                    try:
-                        async with session.head(url) as response:
-                            if response.status == 200:
-                                # Extract page title
-                                title = await self._extract_page_title(session, url)
-                                results.append({
-                                    'url': url,
-                                    'title': title or url.split('/')[-1].title(),
-                                    'snippet': f"Found via sitemap analysis",
-                                    'source': 'sitemap_fallback'
-                                })
-                                
-                                if len(results) >= num_results:
-                                    break
-                                    
-                    except Exception:
-                        continue  # Skip failed URLs
-                        
+            # Probe all candidate URLs concurrently over the shared connection pool
+            session = await self._get_session()
+            probes = await asyncio.gather(*(self._probe_url(session, url) for url in patterns))
+            # Several patterns can redirect to the same page (e.g. /plans -> /pricing)
+            results = list(self._deduplicate_results(result for result in probes if result))[:num_results]
+        
         logger.info(f"✅ Sitemap fallback: {len(results)} results for '{query}'")
         return results
 
+    async def _probe_url(self, session: aiohttp.ClientSession, url: str) -> Optional[Dict[str, Any]]:
+        """
+        HEAD-check a candidate URL and return it as a search result (with page title) if it exists.
+        
+        Redirects are followed (e.g. /pricing -> /en/pricing) and the final URL is returned.
+        Servers that reject HEAD get a one-byte ranged GET instead of a full download.
+        """
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                status = response.status
+                final_url = str(response.url)
+            if status in (405, 501):
+                async with session.get(url, headers={'Range': 'bytes=0-0'}, allow_redirects=True) as response:
+                    status = response.status
+                    final_url = str(response.url)
+            # Sites commonly send unknown paths to the homepage, which is not a match for the pattern
+            if not 200 <= status < 300 or urlparse(final_url).path in ('', '/'):
+                return None
+            url = final_url
+            
+            # Extract page title
+            title = await self._extract_page_title(session, url)
+            return {
+                'url': url,
+                'title': title or url.split('/')[-1].title(),
+                'snippet': f"Found via sitemap analysis",
+                'source': 'sitemap_fallback'
+            }
+        except Exception:
+            return None  # Skip failed URLs
+
     async def _extract_page_title(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
         """Extract page title for better result presentation."""
+        cache_key = ('page_title', url)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             async with session.get(url) as response:
                 if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    title_tag = soup.find('title')
-                    if title_tag:
-                        return title_tag.text.strip()
+                    # Read only the start of the page instead of downloading and parsing the whole body
+                    # The pattern runs on the raw bytes so only the title itself gets decoded
+                    head = b''
+                    match = None
+                    while match is None and len(head) < _TITLE_SCAN_BYTES:
+                        chunk = await response.content.read(_TITLE_SCAN_BYTES - len(head))
+                        if not chunk:
+                            break
+                        head += chunk
+                        match = _TITLE_RE.search(head)
+                    
+                    if match:
+                        title = match.group(1).decode(response.charset or 'utf-8', errors='ignore')
+                        title = html.unescape(title).strip()
+                        if title:
+                            self._cache_set(cache_key, title, ttl=3600)
+                            return title
         except Exception:
             pass
         return None
@@ -334,6 +835,9 @@ class URLDiscoveryService:
         3. Use LLM to select single best URL from top 10
         4. Validate confidence and brand recognition before returning results
         
+        Categories with a clearly matching same-domain page (e.g. /pricing, /en/pricing) skip steps 2-3,
+        as do categories with at most 3 same-domain candidates and a clear keyword winner among them.
+        
         Args:
             competitor_name: Name of the competitor
             base_url: Base URL of the competitor
@@ -351,6 +855,9 @@ class URLDiscoveryService:
         if not categories:
             categories = ['pricing', 'features', 'blog']
         
+        # Scores only repeat within a run, so earlier runs' entries would just accumulate
+        self._relevance_scores.clear()
+        
         # Step 1: Validate company and discover official domains
         logger.info(f"🔍 Step 1: Validating company and discovering domains for {competitor_name}...")
         domain_discovery_result = await self._discover_brand_domains_with_confidence(competitor_name, base_url)
@@ -371,36 +878,30 @@ class URLDiscoveryService:
         
         # Step 3: Execute searches and group by category
         logger.info(f"🔍 Step 3: Executing searches and grouping by category...")
-        category_results = {}
         
-        for category in categories:
-            category_results[category] = []
+        async def search_category(category: str) -> List[Dict[str, Any]]:
+            category_queries = search_queries[category]
+            query_results = await asyncio.gather(*(self._search_query(query) for query in category_queries))
             
-            # Find queries for this category
-            category_queries = [q for q in search_queries if category in q.lower()]
+            # Drop URLs already returned by an earlier query before they reach the LLM
+            seen_urls = set()  # Normalized URLs already collected for this category
+            collected = []
+            for results in query_results:
+                collected.extend(self._deduplicate_results(results, seen_urls))
             
-            for query in category_queries:
-                for tool in self.search_tools:
-                    try:
-                        logger.info(f"🔧 Searching for '{query}' using {tool['name']}")
-                        if tool['name'] == 'google_custom_search':
-                            results = await self._google_custom_search(query, 10)
-                        elif tool['name'] == 'brave_search_api':
-                            results = await self._brave_search_api(query, 10)
-                        else:
-                            continue
-                        
-                        if results:
-                            logger.info(f"✅ {tool['name']}: Found {len(results)} results")
-                            category_results[category].extend(results)
-                            break  # Use first successful search backend
-                    except Exception as e:
-                        logger.warning(f"⚠️ {tool['name']} failed for '{query}': {e}")
-                        continue
+            # One summary line per category instead of one per query and backend
+            logger.info(f"✅ {category}: {len(collected)} unique results from {len(category_queries)} queries")
+            return collected
+        
+        # Categories and their queries are independent, so all searches run concurrently
+        category_outputs = await asyncio.gather(*(search_category(category) for category in categories))
+        category_results = dict(zip(categories, category_outputs))
         
         # Step 4: Filter to same-domain URLs and validate relevance
         logger.info(f"🔍 Step 4: Filtering and validating results...")
-        final_results = []
+        selected = {}
+        candidates_by_category = {}
+        domain_index = self._build_domain_index(base_url, official_domains)
         
         for category, results in category_results.items():
             if not results:
@@ -408,10 +909,10 @@ class URLDiscoveryService:
                 continue
             
             # Filter to same domain
-            same_domain_results = []
-            for result in results:
-                if self._is_same_domain(result.get('url', ''), base_url, official_domains):
-                    same_domain_results.append(result)
+            same_domain_results = [
+                result for result in results
+                if self._is_same_domain(result.get('url', ''), domain_index)
+            ]
             
             logger.info(f"📊 {category}: {len(same_domain_results)} same-domain URLs from {len(results)} total")
             
@@ -419,53 +920,100 @@ class URLDiscoveryService:
                 logger.warning(f"⚠️ No same-domain results for category: {category}")
                 continue
             
-            # Step 5: Use LLM to rank top 10 most relevant URLs with confidence validation
-            logger.info(f"🤖 Step 5: Using {ranking_llm} to rank most relevant URLs for {category}...")
-            ranking_result = await self._llm_rank_urls_for_category_with_confidence(
-                same_domain_results, category, competitor_name, ranking_llm, limit=10
-            )
-            
-            if not ranking_result['success']:
-                logger.warning(f"⚠️ Ranking failed for {category}: {ranking_result['reason']}")
-                continue
+            # Canonical category pages (e.g. /pricing) are taken directly without LLM ranking/selection
+            pattern_match, pattern_confidence = self._pattern_match_url(same_domain_results, category)
+            if pattern_match:
+                overall_confidence = min(brand_confidence, pattern_confidence)
+                if overall_confidence >= min_confidence_threshold:
+                    logger.info(f"⚡ {category.upper()}: Pattern matched {pattern_match.get('url')} (confidence: {overall_confidence:.2f}), skipping LLM")
+                    selected[category] = {
+                        **pattern_match,
+                        'category': category,
+                        'confidence_score': overall_confidence,
+                        'discovery_method': 'pattern_matching_fast_path',
+                        'brand_confidence': brand_confidence
+                    }
+                    continue
             
-            top_urls = ranking_result['urls']
-            ranking_confidence = ranking_result['confidence']
+            # With only a few candidates, ranking adds nothing; a clear keyword winner is taken directly
+            if len(same_domain_results) <= _LOCAL_SELECTION_MAX_CANDIDATES:
+                local_match = self._local_select_url(same_domain_results, category)
+                overall_confidence = min(brand_confidence, _LOCAL_SELECTION_CONFIDENCE)
+                if local_match and overall_confidence >= min_confidence_threshold:
+                    logger.info(f"⚡ {category.upper()}: Selected {local_match.get('url')} from {len(same_domain_results)} candidates locally (confidence: {overall_confidence:.2f}), skipping LLM")
+                    selected[category] = {
+                        **local_match,
+                        'category': category,
+                        'confidence_score': overall_confidence,
+                        'discovery_method': 'local_scoring_fast_path',
+                        'brand_confidence': brand_confidence
+                    }
+                    continue
             
-            # Step 6: Use LLM to select best URL with confidence validation
-            logger.info(f"🤖 Step 6: Using {selection_llm} to select best URL from top {len(top_urls)} for {category}...")
-            selection_result = await self._llm_select_best_url_with_confidence(
-                top_urls, category, competitor_name, selection_llm
+            candidates_by_category[category] = same_domain_results
+        
+        # Step 5: Use LLM to rank top 10 most relevant URLs for all categories in one call
+        logger.info(f"🤖 Step 5: Using {ranking_llm} to rank most relevant URLs for {len(candidates_by_category)} categories...")
+        batch_rankings = await self._llm_rank_urls_batch_with_confidence(
+            candidates_by_category, competitor_name, ranking_llm, limit=10
+        )
+        
+        # Fallback LLM calls per category run concurrently; _llm_slot keeps them under LLM rate limits
+        async def rank_category(category: str):
+            logger.info(f"🤖 Step 5: Using {ranking_llm} to rank most relevant URLs for {category}...")
+            return await self._llm_rank_urls_for_category_with_confidence(
+                candidates_by_category[category], category, competitor_name, ranking_llm, limit=10
             )
-            
-            if not selection_result['success']:
-                logger.warning(f"⚠️ Selection failed for {category}: {selection_result['reason']}")
-                continue
-            
-            best_url = selection_result['url']
-            selection_confidence = selection_result['confidence']
-            
-            # Calculate overall confidence
-            overall_confidence = min(brand_confidence, ranking_confidence, selection_confidence)
-            
-            # Apply confidence threshold
-            if overall_confidence < min_confidence_threshold:
-                logger.warning(f"⚠️ {category}: Overall confidence {overall_confidence:.2f} below threshold {min_confidence_threshold}")
-                logger.warning(f"   Skipping to avoid potentially incorrect results")
-                continue
-            
-            final_results.append({
-                **best_url,
-                'category': category,
-                'confidence_score': overall_confidence,
-                'discovery_method': f'{ranking_llm}_ranking + {selection_llm}_selection',
-                'ranking_llm': ranking_llm,
-                'selection_llm': selection_llm,
-                'brand_confidence': brand_confidence,
-                'ranking_confidence': ranking_confidence,
-                'selection_confidence': selection_confidence
-            })
-            logger.info(f"✅ {category.upper()}: Selected {best_url.get('url')} (confidence: {overall_confidence:.2f})")
+        
+        # Rank the categories the batch call missed one by one
+        unranked = [category for category in candidates_by_category if category not in batch_rankings]
+        outcomes = await asyncio.gather(*(rank_category(category) for category in unranked), return_exceptions=True)
+        for category, outcome in zip(unranked, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = {'success': False, 'reason': f'Ranking error: {str(outcome)}', 'confidence': 0.0}
+            batch_rankings[category] = outcome
+        
+        rankings = {}
+        for category in candidates_by_category:
+            ranking_result = batch_rankings[category]
+            if ranking_result['success']:
+                rankings[category] = ranking_result
+            else:
+                logger.warning(f"⚠️ Ranking failed for {category}: {ranking_result['reason']}")
+        
+        # Step 6: Use LLM to select the best URL for all ranked categories in one call. When the same
+        # LLM ranks and selects, the batch ranking answer already carries the selection.
+        preselected = {}
+        if ranking_llm == selection_llm:
+            preselected = {
+                category: ranking_result['selection']
+                for category, ranking_result in rankings.items() if 'selection' in ranking_result
+            }
+        
+        logger.info(f"🤖 Step 6: Using {selection_llm} to select best URLs for {len(rankings) - len(preselected)} categories...")
+        batch_selections = await self._llm_select_best_urls_batch_with_confidence(
+            {category: ranking_result['urls'] for category, ranking_result in rankings.items() if category not in preselected},
+            competitor_name, selection_llm
+        )
+        batch_selections.update(preselected)
+        
+        outcomes = await asyncio.gather(
+            *(self._select_for_category(category, ranking_result, batch_selections.get(category), competitor_name,
+                                        ranking_llm, selection_llm, brand_confidence, min_confidence_threshold)
+              for category, ranking_result in rankings.items()),
+            return_exceptions=True
+        )
+        
+        for category, outcome in zip(rankings, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"❌ URL selection failed for {category}: {outcome}")
+            elif outcome:
+                selected[category] = outcome
+        
+        final_results = [selected[category] for category in category_results if category in selected]
+        
+        # A stale brand domain refresh started in step 1 has been running alongside steps 2-6
+        await self._finish_revalidations()
         
         logger.info(f"🎯 Discovery complete: {len(final_results)} URLs found across {len(categories)} categories")
         
@@ -475,8 +1023,244 @@ class URLDiscoveryService:
         
         return final_results
 
+    async def _search_query(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Run one query against the search backends, returning the first non-empty results.
+        
+        Backends start in priority order. The next one is started when the previous one fails
+        or comes back empty, or when its request has been in flight for _SEARCH_HEDGE_DELAY
+        seconds, so a slow backend costs at most that delay; the slower request is cancelled
+        once one succeeds. Time spent queued at the rate gates does not count towards the delay,
+        and no hedge is sent to a backend whose gate is already busy.
+        """
+        backends = [tool for tool in self.search_tools if tool['name'] in _SEARCH_BACKENDS]
+        tools_by_task = {}
+        pending = set()
+        hedge_timer = None
+        
+        async def hedge_delay(started: asyncio.Event):
+            await started.wait()
+            await asyncio.sleep(_SEARCH_HEDGE_DELAY)
+        
+        def start_next_backend():
+            nonlocal hedge_timer
+            if hedge_timer is not None:
+                hedge_timer.cancel()
+                hedge_timer = None
+            if len(tools_by_task) >= len(backends):
+                return
+            tool = backends[len(tools_by_task)]
+            logger.debug("🔧 Searching for '%s' using %s", query, tool['name'])
+            started = asyncio.Event()
+            task = asyncio.create_task(self._run_search_backend(tool, query, started))
+            tools_by_task[task] = tool
+            pending.add(task)
+            if len(tools_by_task) < len(backends):
+                hedge_timer = asyncio.create_task(hedge_delay(started))
+        
+        start_next_backend()
+        try:
+            while pending:
+                waiting = pending | {hedge_timer} if hedge_timer is not None else pending
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                
+                if hedge_timer in done:
+                    # Slow: bring in the next backend unless it is already saturated
+                    hedge_timer = None
+                    next_backend = backends[len(tools_by_task)]['name']
+                    if self._search_gate_busy(next_backend):
+                        logger.debug("⏳ Not hedging '%s' to %s, its rate gate is busy", query, next_backend)
+                    else:
+                        start_next_backend()
+                
+                for task in done & pending:
+                    pending.discard(task)
+                    name = tools_by_task[task]['name']
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        logger.warning(f"⚠️ {name} failed for '{query}': {e}")
+                        results = None
+                    if results:
+                        logger.debug("✅ %s: Found %d results", name, len(results))
+                        return results  # Use first successful search backend
+                    
+                    # Failed or empty: bring in the next backend
+                    start_next_backend()
+            return []
+        finally:
+            for task in (*pending, hedge_timer):
+                if task is not None:
+                    task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run_search_backend(self, tool: Dict[str, Any], query: str, started: asyncio.Event) -> List[Dict[str, Any]]:
+        """Query one search backend (its requests are gated by _search_slot, which sets started)."""
+        # Runs in its own task, so the context variable only applies to this backend's requests
+        _SEARCH_REQUEST_STARTED.set(started)
+        return await tool['handler'](query, 10)
+
+    def _search_gate_busy(self, backend: str) -> bool:
+        """Whether a search backend's rate gate would make a new request queue behind earlier ones."""
+        gate = self._search_limits[backend]
+        return gate['semaphore'].locked() or gate['next_request_at'] > time.monotonic()
+
+    @staticmethod
+    def _new_rate_gates(limits_by_name: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+        """Build request gates (a concurrency limit plus the earliest time the next request may start) per API."""
+        return {
+            name: {
+                'semaphore': asyncio.Semaphore(limits['max_concurrent']),
+                'min_interval': limits['min_interval'],
+                'next_request_at': 0.0
+            }
+            for name, limits in limits_by_name.items()
+        }
+
+    @contextlib.asynccontextmanager
+    async def _rate_slot(self, gate: Dict[str, Any], shared_semaphore: asyncio.Semaphore):
+        """
+        Hold a request slot on a rate gate, then on the shared semaphore.
+        
+        Bounds both the overall and the per-API number of in-flight requests, and spaces
+        request starts at least min_interval apart so bursts stay under the API's rate limit
+        instead of turning into 429 retries.
+        """
+        async with gate['semaphore']:
+            now = time.monotonic()
+            start_at = max(now, gate['next_request_at'])
+            gate['next_request_at'] = start_at + gate['min_interval']
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+            # The shared limit is only taken once the request is ready to go out
+            async with shared_semaphore:
+                yield
+
+    @contextlib.asynccontextmanager
+    async def _search_slot(self, backend: str):
+        """Hold a request slot for a search backend (cache hits never take one)."""
+        async with self._rate_slot(self._search_limits[backend], self._search_semaphore):
+            started = _SEARCH_REQUEST_STARTED.get()
+            if started is not None:
+                started.set()
+            yield
+
+    def _llm_slot(self, provider: str):
+        """Hold a request slot for an LLM provider ("openai" or "cohere")."""
+        return self._rate_slot(self._llm_limits[provider], self._llm_semaphore)
+
+    async def _select_for_category(self, category: str, ranking_result: Dict[str, Any],
+                                   selection_result: Optional[Dict[str, Any]], competitor_name: str,
+                                   ranking_llm: str, selection_llm: str, brand_confidence: float,
+                                   min_confidence_threshold: float) -> Optional[Dict[str, Any]]:
+        """Select (unless already selected) the best ranked URL for one category, applying the confidence threshold."""
+        top_urls = ranking_result['urls']
+        ranking_confidence = ranking_result['confidence']
+        
+        if selection_result is None:
+            # Fall back to a dedicated selection call when the batch missed this category
+            logger.info(f"🤖 Step 6: Using {selection_llm} to select best URL from top {len(top_urls)} for {category}...")
+            selection_result = await self._llm_select_best_url_with_confidence(
+                top_urls, category, competitor_name, selection_llm
+            )
+        
+        if not selection_result['success']:
+            logger.warning(f"⚠️ Selection failed for {category}: {selection_result['reason']}")
+            return None
+        
+        best_url = selection_result['url']
+        selection_confidence = selection_result['confidence']
+        
+        # Calculate overall confidence
+        overall_confidence = min(brand_confidence, ranking_confidence, selection_confidence)
+        
+        # Apply confidence threshold
+        if overall_confidence < min_confidence_threshold:
+            logger.warning(f"⚠️ {category}: Overall confidence {overall_confidence:.2f} below threshold {min_confidence_threshold}")
+            logger.warning(f"   Skipping to avoid potentially incorrect results")
+            return None
+        
+        logger.info(f"✅ {category.upper()}: Selected {best_url.get('url')} (confidence: {overall_confidence:.2f})")
+        # Build a new dict instead of mutating best_url: search result dicts are shared with the
+        # response cache and can appear under more than one category
+        return {
+            **best_url,
+            'category': category,
+            'confidence_score': overall_confidence,
+            'discovery_method': f'{ranking_llm}_ranking + {selection_llm}_selection',
+            'ranking_llm': ranking_llm,
+            'selection_llm': selection_llm,
+            'brand_confidence': brand_confidence,
+            'ranking_confidence': ranking_confidence,
+            'selection_confidence': selection_confidence
+        }
+
+    def _normalize_url(self, url: str) -> str:
+        """
+        Normalize a URL for deduplication (case-insensitive host, no default port, trailing slash or fragment, sorted query).
+        
+        Near-duplicates of one page also normalize alike: tracking parameters are dropped and
+        www./m. mirror hosts fold into the bare domain.
+        """
+        try:
+            parsed = urlparse(url.strip())
+            scheme = parsed.scheme.lower()
+            host = (parsed.hostname or '').lower()
+            for prefix in _MIRROR_HOST_PREFIXES:
+                if host.startswith(prefix) and '.' in host[len(prefix):]:
+                    host = host[len(prefix):]
+                    break
+            if parsed.port and not ((scheme == 'http' and parsed.port == 80) or (scheme == 'https' and parsed.port == 443)):
+                host = f"{host}:{parsed.port}"
+            path = parsed.path.rstrip('/')
+            params = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                      if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith(_TRACKING_PARAM_PREFIXES)]
+            query = urlencode(sorted(params))
+            return f"{scheme}://{host}{path}" + (f"?{query}" if query else '')
+        except ValueError:
+            return url.strip().lower()
+
+    def _deduplicate_results(self, results: Iterable[Dict[str, Any]], seen_urls: Optional[set] = None) -> Iterator[Dict[str, Any]]:
+        """Yield results whose normalized URL was not seen yet, keeping the first occurrence."""
+        if seen_urls is None:
+            seen_urls = set()
+        
+        for result in results:
+            normalized = self._normalize_url(result.get('url', ''))
+            if normalized not in seen_urls:
+                seen_urls.add(normalized)
+                yield result
+
     async def _discover_brand_domains_with_confidence(self, competitor_name: str, base_url: str) -> Dict[str, Any]:
-        """Discover brand domains with confidence validation."""
+        """Discover brand domains with confidence validation, serving cached results stale-while-revalidate."""
+        cache_key = (competitor_name.lower(), self._extract_domain(base_url))
+        entry = _BRAND_DOMAIN_CACHE.pop(cache_key, None)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < _BRAND_DOMAIN_STALE_TTL:
+                # Re-inserting moves the entry to the end, so eviction drops the least recently used brand
+                _BRAND_DOMAIN_CACHE[cache_key] = entry
+            if age < _BRAND_DOMAIN_FRESH_TTL:
+                return entry[1]
+            if age < _BRAND_DOMAIN_STALE_TTL:
+                if cache_key not in self._revalidations:
+                    logger.info(f"♻️ Refreshing stale brand domains for {competitor_name} in the background")
+                    self._revalidations[cache_key] = asyncio.create_task(
+                        self._validate_brand_domains(competitor_name, base_url, cache_key)
+                    )
+                return entry[1]
+        
+        return await self._validate_brand_domains(competitor_name, base_url, cache_key)
+
+    async def _finish_revalidations(self):
+        """Wait for background brand domain refreshes so they complete before the event loop closes."""
+        if self._revalidations:
+            await asyncio.gather(*self._revalidations.values(), return_exceptions=True)
+            self._revalidations.clear()
+
+    async def _validate_brand_domains(self, competitor_name: str, base_url: str, cache_key: Tuple[str, str]) -> Dict[str, Any]:
+        """Run brand recognition, domain discovery and domain validation, caching successful results."""
         try:
             # First validate the company exists and is recognizable
             validation_result = await self._validate_brand_recognition(competitor_name, base_url)
@@ -494,12 +1278,19 @@ class URLDiscoveryService:
             # Validate discovered domains
             domain_validation = await self._validate_discovered_domains(domains, competitor_name, base_url)
             
-            return {
+            result = {
                 'success': domain_validation['valid'],
                 'domains': domains if domain_validation['valid'] else [],
                 'confidence': min(validation_result['confidence'], domain_validation['confidence']),
                 'reason': domain_validation.get('reason', 'Success')
             }
+            if result['success']:
+                _BRAND_DOMAIN_CACHE.pop(cache_key, None)
+                if len(_BRAND_DOMAIN_CACHE) >= _BRAND_DOMAIN_CACHE_MAX_SIZE:
+                    # Dicts preserve insertion order and hits re-insert, so the first key is the least recently used
+                    del _BRAND_DOMAIN_CACHE[next(iter(_BRAND_DOMAIN_CACHE))]
+                _BRAND_DOMAIN_CACHE[cache_key] = (time.monotonic(), result)
+            return result
             
         except Exception as e:
             logger.error(f"❌ Brand domain discovery failed: {e}")
@@ -511,55 +1302,17 @@ class URLDiscoveryService:
 
     async def _validate_brand_recognition(self, competitor_name: str, base_url: str) -> Dict[str, Any]:
         """Validate if the brand is well-recognized to avoid wrong results."""
-        prompt = f"""
-        Evaluate if "{competitor_name}" is a well-known, legitimate company or brand.
-        
-        Website: {base_url}
-        
-        Consider:
-        - Is this a real company/product that exists?
-        - Is it well-known enough to have reliable search results?
-        - Would search engines return accurate information about this brand?
-        - Is the website domain consistent with the company name?
-        
-        Respond with:
-        RECOGNIZED: [YES/NO]
-        CONFIDENCE: [0.0-1.0]
-        REASON: [Brief explanation]
-        
-        Example responses:
-        RECOGNIZED: YES
-        CONFIDENCE: 0.9
-        REASON: Well-known productivity software company
-        
-        RECOGNIZED: NO
-        CONFIDENCE: 0.2
-        REASON: Unknown company name, may be startup or fictional
-        """
+        prompt = _BRAND_RECOGNITION_PROMPT.format(competitor_name=competitor_name, base_url=base_url)
         
         try:
-            if hasattr(self, 'cohere_client') and self.cohere_client:
-                response_text = await self._cohere_query(prompt)
-            else:
-                response_text = await self._openai_query(prompt)
+            llm_choice = "cohere" if self.cohere_client else "openai"
+            response_text = await self._llm_query(llm_choice, prompt, max_tokens=80)
             
             # Parse response
-            lines = response_text.strip().split('\n')
-            recognized = False
-            confidence = 0.0
-            reason = "Unknown"
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('RECOGNIZED:'):
-                    recognized = 'YES' in line.upper()
-                elif line.startswith('CONFIDENCE:'):
-                    try:
-                        confidence = float(line.split(':')[1].strip())
-                    except:
-                        confidence = 0.5
-                elif line.startswith('REASON:'):
-                    reason = line.split(':', 1)[1].strip()
+            fields = self._parse_response_fields(response_text)
+            recognized = 'YES' in fields.get('RECOGNIZED', '').upper()
+            confidence = self._parse_confidence(fields['CONFIDENCE'], 0.5) if 'CONFIDENCE' in fields else 0.0
+            reason = fields.get('REASON', "Unknown")
             
             return {
                 'is_recognized': recognized,
@@ -592,43 +1345,21 @@ class URLDiscoveryService:
             }
         
         # Additional validation with LLM
-        prompt = f"""
-        Validate if these domains are actually related to "{competitor_name}":
-        
-        Discovered domains: {domains}
-        Expected base domain: {base_domain}
-        
-        Are these domains legitimate and related to the company?
-        
-        Respond with:
-        VALID: [YES/NO]
-        CONFIDENCE: [0.0-1.0]
-        REASON: [Brief explanation]
-        """
+        prompt = _DOMAIN_VALIDATION_PROMPT.format(
+            competitor_name=competitor_name,
+            domains=domains,
+            base_domain=base_domain
+        )
         
         try:
-            if hasattr(self, 'cohere_client') and self.cohere_client:
-                response_text = await self._cohere_query(prompt)
-            else:
-                response_text = await self._openai_query(prompt)
+            llm_choice = "cohere" if self.cohere_client else "openai"
+            response_text = await self._llm_query(llm_choice, prompt, max_tokens=80)
             
             # Parse response
-            lines = response_text.strip().split('\n')
-            valid = True  # Default to valid if we can't parse
-            confidence = 0.8
-            reason = "Domain validation successful"
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('VALID:'):
-                    valid = 'YES' in line.upper()
-                elif line.startswith('CONFIDENCE:'):
-                    try:
-                        confidence = float(line.split(':')[1].strip())
-                    except:
-                        confidence = 0.8
-                elif line.startswith('REASON:'):
-                    reason = line.split(':', 1)[1].strip()
+            fields = self._parse_response_fields(response_text)
+            valid = 'YES' in fields['VALID'].upper() if 'VALID' in fields else True  # Default to valid if we can't parse
+            confidence = self._parse_confidence(fields.get('CONFIDENCE', ''), 0.8)
+            reason = fields.get('REASON', "Domain validation successful")
             
             return {
                 'valid': valid,
@@ -645,13 +1376,8 @@ class URLDiscoveryService:
             }
 
     def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL."""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc.lower()
-        except:
-            return url.lower()
+        """Extract domain from URL (lowercased, without www.; bare domains are returned as-is)."""
+        return _url_host(url) or url.lower()
 
     def _domains_match(self, domain1: str, domain2: str) -> bool:
         """Check if two domains match (considering subdomains)."""
@@ -663,8 +1389,8 @@ class URLDiscoveryService:
             return True
         
         # Remove www prefix for comparison
-        domain1_clean = domain1.replace('www.', '')
-        domain2_clean = domain2.replace('www.', '')
+        domain1_clean = domain1.removeprefix('www.')
+        domain2_clean = domain2.removeprefix('www.')
         
         if domain1_clean == domain2_clean:
             return True
@@ -675,6 +1401,239 @@ class URLDiscoveryService:
         
         return False
 
+    def _format_url_list(self, urls: List[Dict[str, Any]]) -> str:
+        """Format URLs as a numbered list with titles and descriptions for LLM prompts."""
+        # One string per URL; joining on a newline leaves an empty line between entries for readability
+        return "\n".join(
+            f"{i}. {url.get('url', '')}\n"
+            + (f"   Title: {url['title']}\n" if url.get('title') else "")
+            + (f"   Description: {url['snippet'][:_SNIPPET_PROMPT_CHARS]}\n" if url.get('snippet') else "")
+            for i, url in enumerate(urls, 1)
+        )
+
+    def _category_keyword_re(self, category: str) -> re.Pattern:
+        """Compiled whole-word alternation of a category and its variations, built once per category."""
+        pattern = self._keyword_patterns.get(category)
+        if pattern is None:
+            # Word boundaries keep e.g. 'team' out of 'steam' and 'story' out of 'history'
+            alternation = '|'.join(re.escape(keyword) for keyword in sorted(_category_keywords(category)))
+            pattern = re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE)
+            self._keyword_patterns[category] = pattern
+        return pattern
+
+    def _local_relevance_score(self, result: Dict[str, Any], category: str) -> float:
+        """Cheap keyword relevance of a search result to a category (URL path > title > snippet)."""
+        url, title, snippet = result.get('url', ''), result.get('title', ''), result.get('snippet', '')
+        cache_key = (category, url, title, snippet)
+        score = self._relevance_scores.get(cache_key)
+        if score is not None:
+            return score
+        
+        keyword_re = self._category_keyword_re(category)
+        score = 0.0
+        if not _category_keywords(category).isdisjoint(_url_path_tokens(url)):
+            score += 3.0
+        if keyword_re.search(title):
+            score += 2.0
+        if keyword_re.search(snippet):
+            score += 1.0
+        self._relevance_scores[cache_key] = score
+        return score
+
+    def _local_select_url(self, urls: List[Dict[str, Any]], category: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the single clear winner by local relevance score, or None when it is ambiguous.
+        
+        The winner needs a keyword matching a whole URL path segment or word and a strictly higher
+        score than every other candidate; anything less is left to the LLM.
+        """
+        # Only the top two scores matter: the best one and whether anything ties it
+        scored = heapq.nlargest(2, ((self._local_relevance_score(url, category), i) for i, url in enumerate(urls)))
+        best_score, best_index = scored[0]
+        if len(scored) > 1 and scored[1][0] == best_score:
+            return None
+        # A title plus snippet hit also scores 3.0, so the path match is checked on its own
+        best = urls[best_index]
+        if _category_keywords(category).isdisjoint(_url_path_tokens(best.get('url', ''))):
+            return None
+        return best
+
+    def _pattern_match_url(self, urls: List[Dict[str, Any]], category: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Return the URL whose path best matches the category with its pattern confidence, or (None, 0.0)."""
+        slug = _category_slug(category)
+        page_names = (slug,) + _CATEGORY_PAGE_ALIASES.get(slug, ())
+        
+        segment_match = None
+        for url in urls:
+            path = _url_path(url.get('url', '')).strip('/').lower()
+            if path == slug:
+                return url, _PATTERN_MATCH_CONFIDENCE
+            if segment_match is None and path.rpartition('/')[2] in page_names:
+                segment_match = url
+        
+        if segment_match is not None:
+            return segment_match, _PATTERN_SEGMENT_CONFIDENCE
+        return None, 0.0
+
+    def _top_candidates(self, urls: List[Dict[str, Any]], category: str, limit: int) -> List[Dict[str, Any]]:
+        """Keep the `limit` most keyword-relevant URLs for LLM ranking, preserving search order."""
+        if len(urls) <= limit:
+            return urls
+        # nlargest is O(n log k) and stable, so ties keep the search engine's ordering
+        top_indices = heapq.nlargest(limit, range(len(urls)),
+                                     key=lambda i: self._local_relevance_score(urls[i], category))
+        return [urls[i] for i in sorted(top_indices)]
+
+    def _parse_first_int(self, text: str) -> Optional[int]:
+        """Return the first run of ASCII digits in text as an int (e.g. " [2] pricing" -> 2)."""
+        start = -1
+        for i, ch in enumerate(text):
+            if '0' <= ch <= '9':
+                if start == -1:
+                    start = i
+            elif start != -1:
+                return int(text[start:i])
+        return int(text[start:]) if start != -1 else None
+
+    def _parse_response_fields(self, response_text: str) -> Dict[str, str]:
+        """Collect the KEY: value lines of an LLM response in one pass (later lines win)."""
+        return {key: value.strip() for key, value in _RESPONSE_FIELD_RE.findall(response_text)}
+
+    def _parse_confidence(self, text: str, default: float) -> float:
+        """Parse a 0.0-1.0 confidence value from an LLM response field, or return default."""
+        try:
+            # Well-formed answers are a bare number, which needs no regex
+            confidence = float(text)
+        except ValueError:
+            match = _CONFIDENCE_RE.search(text)
+            if not match:
+                return default
+            confidence = float(match.group())
+        if not math.isfinite(confidence):
+            return default
+        if not 0.0 <= confidence <= 1.0:
+            # Out-of-range answers point at a prompt/format problem rather than a real confidence
+            logger.warning(f"⚠️ LLM confidence {confidence} outside 0.0-1.0, clamping")
+            return 0.0 if confidence < 0.0 else 1.0
+        return confidence
+
+    def _parse_json_object(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """Extract the first JSON object from an LLM response (ignoring code fences or extra text)."""
+        start = response_text.find('{')
+        end = response_text.rfind('}')
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = _json_loads(response_text[start:end + 1])
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    async def _llm_rank_urls_batch_with_confidence(self, urls_by_category: Dict[str, List[Dict[str, Any]]],
+                                                   competitor_name: str, llm_choice: str,
+                                                   limit: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Rank URLs for several categories with a single LLM call.
+        
+        Returns ranking results keyed by category in the same format as
+        _llm_rank_urls_for_category_with_confidence. Categories missing from the
+        response (or an unparseable response) are left out so callers can fall back
+        to per-category ranking.
+        """
+        if len(urls_by_category) < 2:
+            return {}
+        
+        # Limit input URLs per category to prevent token overflow
+        inputs = {category: self._top_candidates(urls, category, 20) for category, urls in urls_by_category.items()}
+        
+        # Categories whose candidate set was ranked before are answered from the cache
+        rankings = {}
+        for category in list(inputs):
+            cached = self._cache_get(self._candidate_set_cache_key('ranking', llm_choice, competitor_name,
+                                                                   category, inputs[category]))
+            if cached is not None:
+                rankings[category] = cached
+                del inputs[category]
+        if len(inputs) < 2:
+            return rankings
+        
+        sections = []
+        for category, input_urls in inputs.items():
+            sections.append(f"CATEGORY: {category}\n{self._format_url_list(input_urls)}")
+        categories_text = "\n".join(sections)
+        
+        prompt = _BATCH_RANK_PROMPT.format(
+            competitor_name=competitor_name,
+            categories_text=categories_text,
+            limit=limit
+        )
+        
+        try:
+            max_tokens = _BATCH_RANK_TOKENS_PER_CATEGORY * len(inputs) + _BATCH_TOKENS_OVERHEAD
+            response_text = await self._llm_query(llm_choice, prompt, max_tokens=max_tokens,
+                                                  system_prompt=_URL_JUDGE_SYSTEM_PROMPT, json_mode=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Batch LLM ranking failed, falling back to per-category ranking: {e}")
+            return rankings
+        
+        data = self._parse_json_object(response_text)
+        if data is None:
+            logger.warning("⚠️ Could not parse batch ranking response, falling back to per-category ranking")
+            return rankings
+        
+        for category, input_urls in inputs.items():
+            entry = data.get(category)
+            if not isinstance(entry, dict) or not isinstance(entry.get('ranking'), list):
+                continue
+            
+            confidence = self._parse_confidence(str(entry.get('confidence', '')), 0.5)
+            reason = str(entry.get('reason', 'Ranking completed'))
+            
+            ranked_indices = []
+            for num in entry['ranking']:
+                try:
+                    idx = int(num) - 1  # Convert to 0-based index
+                except (TypeError, ValueError):
+                    continue
+                if 0 <= idx < len(input_urls) and idx not in ranked_indices:
+                    ranked_indices.append(idx)
+            
+            if not ranked_indices:
+                rankings[category] = {
+                    'success': False,
+                    'reason': 'LLM determined no URLs are relevant for this category',
+                    'confidence': 0.0
+                }
+                continue
+            
+            ranked_indices = ranked_indices[:limit]
+            rankings[category] = {
+                'success': True,
+                'urls': [input_urls[idx] for idx in ranked_indices],
+                'confidence': confidence,
+                'reason': reason
+            }
+            
+            # The same answer also names the best URL, which saves the separate selection call
+            try:
+                selection_idx = int(entry.get('selection')) - 1
+            except (TypeError, ValueError):
+                selection_idx = None
+            if selection_idx in ranked_indices:
+                rankings[category]['selection'] = {
+                    'success': True,
+                    'url': input_urls[selection_idx],
+                    'confidence': confidence,
+                    'reason': reason
+                }
+            self._cache_set(self._candidate_set_cache_key('ranking', llm_choice, competitor_name, category, input_urls),
+                            rankings[category], ttl=_LLM_CACHE_TTL)
+            logger.debug("📊 Ranked %d URLs for %s using %s (confidence: %.2f)",
+                         len(rankings[category]['urls']), category, llm_choice, confidence)
+        
+        logger.info(f"📦 Batch ranking covered {len(rankings)}/{len(inputs)} categories in one {llm_choice} call")
+        return rankings
+
     async def _llm_rank_urls_for_category_with_confidence(self, urls: List[Dict[str, Any]], category: str, 
                                         competitor_name: str, llm_choice: str, limit: int = 10) -> Dict[str, Any]:
         """Use LLM to rank URLs by relevance with confidence validation."""
@@ -682,52 +1641,25 @@ class URLDiscoveryService:
             return {'success': False, 'reason': 'No URLs to rank', 'confidence': 0.0}
         
         # Limit input URLs to prevent token overflow
-        input_urls = urls[:20]  # Max 20 URLs to rank
+        input_urls = self._top_candidates(urls, category, 20)  # Max 20 URLs to rank
+        cache_key = self._candidate_set_cache_key('ranking', llm_choice, competitor_name, category, input_urls)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Create URL list for LLM
-        url_list = []
-        for i, url in enumerate(input_urls, 1):
-            url_list.append(f"{i}. {url.get('url', '')}")
-            if url.get('title'):
-                url_list.append(f"   Title: {url.get('title', '')}")
-            if url.get('snippet'):
-                url_list.append(f"   Description: {url.get('snippet', '')}")
-            url_list.append("")  # Empty line for readability
-        
-        urls_text = "\n".join(url_list)
-        
-        prompt = f"""
-        Rank these URLs by relevance for finding {category} information about {competitor_name}.
-        
-        URLs to rank:
-        {urls_text}
-        
-        Please rank them from most relevant to least relevant for {category} information.
-        Consider:
-        - URL path relevance (e.g., /pricing for pricing category)
-        - Title relevance to {category}
-        - Description relevance to {category}
-        - Overall quality for competitive analysis
-        
-        IMPORTANT: If none of the URLs seem relevant to {category} for {competitor_name}, 
-        respond with "NO_RELEVANT_URLS" instead of ranking.
-        
-        If URLs are relevant, respond with the top {limit} most relevant URLs in order:
-        RANKING: [URL numbers in order]
-        CONFIDENCE: [0.0-1.0 confidence in the ranking]
-        REASON: [Brief explanation]
-        
-        Example response:
-        RANKING: 3,7,1,5
-        CONFIDENCE: 0.8
-        REASON: URLs clearly related to pricing with official domain
-        """
+        urls_text = self._format_url_list(input_urls)
+        
+        prompt = _RANK_PROMPT.format(
+            category=category,
+            competitor_name=competitor_name,
+            urls_text=urls_text,
+            limit=limit
+        )
         
         try:
-            if llm_choice == "cohere":
-                response_text = await self._cohere_query(prompt)
-            else:  # openai
-                response_text = await self._openai_query(prompt)
+            response_text = await self._llm_query(llm_choice, prompt, max_tokens=100,
+                                                  system_prompt=_URL_JUDGE_SYSTEM_PROMPT)
             
             # Check for no relevant URLs response
             if "NO_RELEVANT_URLS" in response_text.upper():
@@ -738,21 +1670,10 @@ class URLDiscoveryService:
                 }
             
             # Parse the ranking response
-            ranking_line = ""
-            confidence = 0.5
-            reason = "Ranking completed"
-            
-            for line in response_text.split('\n'):
-                line = line.strip()
-                if line.startswith('RANKING:'):
-                    ranking_line = line.split(':', 1)[1].strip()
-                elif line.startswith('CONFIDENCE:'):
-                    try:
-                        confidence = float(line.split(':')[1].strip())
-                    except:
-                        confidence = 0.5
-                elif line.startswith('REASON:'):
-                    reason = line.split(':', 1)[1].strip()
+            fields = self._parse_response_fields(response_text)
+            ranking_line = fields.get('RANKING', "")
+            confidence = self._parse_confidence(fields.get('CONFIDENCE', ''), 0.5)
+            reason = fields.get('REASON', "Ranking completed")
             
             if not ranking_line:
                 return {
@@ -763,13 +1684,10 @@ class URLDiscoveryService:
             
             # Parse ranking indices
             ranked_indices = []
-            for num_str in ranking_line.split(','):
-                try:
-                    idx = int(num_str.strip()) - 1  # Convert to 0-based index
-                    if 0 <= idx < len(input_urls):
-                        ranked_indices.append(idx)
-                except ValueError:
-                    continue
+            for num_str in _INT_RE.findall(ranking_line):
+                idx = int(num_str) - 1  # Convert to 0-based index
+                if 0 <= idx < len(input_urls) and idx not in ranked_indices:
+                    ranked_indices.append(idx)
             
             if not ranked_indices:
                 return {
@@ -785,12 +1703,14 @@ class URLDiscoveryService:
             
             logger.info(f"📊 Ranked {len(ranked_urls)} URLs for {category} using {llm_choice} (confidence: {confidence:.2f})")
             
-            return {
+            ranking = {
                 'success': True,
                 'urls': ranked_urls,
                 'confidence': confidence,
                 'reason': reason
             }
+            self._cache_set(cache_key, ranking, ttl=_LLM_CACHE_TTL)
+            return ranking
             
         except Exception as e:
             logger.error(f"❌ LLM ranking failed for {category}: {e}")
@@ -800,6 +1720,87 @@ class URLDiscoveryService:
                 'confidence': 0.0
             }
 
+    async def _llm_select_best_urls_batch_with_confidence(self, urls_by_category: Dict[str, List[Dict[str, Any]]],
+                                                          competitor_name: str, llm_choice: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Select the best URL for several categories with a single LLM call.
+        
+        Returns selection results keyed by category in the same format as
+        _llm_select_best_url_with_confidence. Single-URL categories need no LLM and,
+        like categories missing from the response, are left out so callers fall back
+        to per-category selection.
+        """
+        inputs = {category: urls for category, urls in urls_by_category.items() if len(urls) > 1}
+        
+        # Categories whose candidate set was selected from before are answered from the cache
+        selections = {}
+        for category in list(inputs):
+            cached = self._cache_get(self._candidate_set_cache_key('selection', llm_choice, competitor_name,
+                                                                   category, inputs[category]))
+            if cached is not None:
+                selections[category] = cached
+                del inputs[category]
+        if len(inputs) < 2:
+            return selections
+        
+        sections = []
+        for category, urls in inputs.items():
+            sections.append(f"CATEGORY: {category}\n{self._format_url_list(urls)}")
+        categories_text = "\n".join(sections)
+        
+        prompt = _BATCH_SELECT_PROMPT.format(
+            competitor_name=competitor_name,
+            categories_text=categories_text
+        )
+        
+        try:
+            max_tokens = _BATCH_SELECT_TOKENS_PER_CATEGORY * len(inputs) + _BATCH_TOKENS_OVERHEAD
+            response_text = await self._llm_query(llm_choice, prompt, max_tokens=max_tokens,
+                                                  system_prompt=_URL_JUDGE_SYSTEM_PROMPT, json_mode=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Batch LLM selection failed, falling back to per-category selection: {e}")
+            return selections
+        
+        data = self._parse_json_object(response_text)
+        if data is None:
+            logger.warning("⚠️ Could not parse batch selection response, falling back to per-category selection")
+            return selections
+        
+        for category, urls in inputs.items():
+            entry = data.get(category)
+            if not isinstance(entry, dict) or 'selection' not in entry:
+                continue
+            
+            if entry['selection'] is None:
+                selections[category] = {
+                    'success': False,
+                    'reason': 'LLM determined no URLs are suitable for this category',
+                    'confidence': 0.0
+                }
+                continue
+            
+            try:
+                selection_num = int(entry['selection'])
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= selection_num <= len(urls):
+                continue
+            
+            confidence = self._parse_confidence(str(entry.get('confidence', '')), 0.5)
+            
+            selections[category] = {
+                'success': True,
+                'url': urls[selection_num - 1],  # Convert to 0-based index
+                'confidence': confidence,
+                'reason': str(entry.get('reason', 'Selection completed'))
+            }
+            self._cache_set(self._candidate_set_cache_key('selection', llm_choice, competitor_name, category, urls),
+                            selections[category], ttl=_LLM_CACHE_TTL)
+            logger.debug("🎯 Selected URL %d for %s using %s (confidence: %.2f)", selection_num, category, llm_choice, confidence)
+        
+        logger.info(f"📦 Batch selection covered {len(selections)}/{len(inputs)} categories in one {llm_choice} call")
+        return selections
+
     async def _llm_select_best_url_with_confidence(self, urls: List[Dict[str, Any]], category: str, 
                                  competitor_name: str, llm_choice: str) -> Dict[str, Any]:
         """Use LLM to select the single best URL with confidence validation."""
@@ -814,78 +1815,50 @@ class URLDiscoveryService:
                 'reason': 'Single URL available'
             }
         
+        cache_key = self._candidate_set_cache_key('selection', llm_choice, competitor_name, category, urls)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Create URL options for LLM
-        url_options = []
-        for i, url in enumerate(urls, 1):
-            url_options.append(f"{i}. {url.get('url', '')}")
-            if url.get('title'):
-                url_options.append(f"   Title: {url.get('title', '')}")
-            if url.get('snippet'):
-                url_options.append(f"   Description: {url.get('snippet', '')}")
-            url_options.append("")  # Empty line for readability
-        
-        options_text = "\n".join(url_options)
-        
-        prompt = f"""
-        Select the single best URL for finding {category} information about {competitor_name}.
-        
-        Your options:
-        {options_text}
-        
-        Choose the URL that would be most valuable for competitive analysis of {competitor_name}'s {category}.
-        Consider:
-        - Most direct/official {category} information
-        - Comprehensive {category} details
-        - Up-to-date information
-        - Competitive intelligence value
-        
-        IMPORTANT: If none of the URLs seem appropriate for {category} information about {competitor_name},
-        respond with "NO_SUITABLE_URL" instead of selecting.
-        
-        If a URL is suitable, respond with:
-        SELECTION: [URL number]
-        CONFIDENCE: [0.0-1.0 confidence in the selection]
-        REASON: [Brief explanation why this URL is best]
-        
-        Example response:
-        SELECTION: 2
-        CONFIDENCE: 0.9
-        REASON: Official pricing page with comprehensive plan details
-        """
+        options_text = self._format_url_list(urls)
+        
+        prompt = _SELECT_PROMPT.format(
+            category=category,
+            competitor_name=competitor_name,
+            options_text=options_text
+        )
         
         try:
-            if llm_choice == "cohere":
-                response_text = await self._cohere_query(prompt)
-            else:  # openai
-                response_text = await self._openai_query(prompt)
-            
-            # Check for no suitable URL response
-            if "NO_SUITABLE_URL" in response_text.upper():
-                return {
-                    'success': False,
-                    'reason': 'LLM determined no URLs are suitable for this category',
-                    'confidence': 0.0
-                }
-            
-            # Parse the selection response
-            selection_num = None
-            confidence = 0.5
-            reason = "Selection completed"
-            
-            for line in response_text.split('\n'):
-                line = line.strip()
-                if line.startswith('SELECTION:'):
-                    try:
-                        selection_num = int(line.split(':')[1].strip())
-                    except:
-                        continue
-                elif line.startswith('CONFIDENCE:'):
-                    try:
-                        confidence = float(line.split(':')[1].strip())
-                    except:
-                        confidence = 0.5
-                elif line.startswith('REASON:'):
-                    reason = line.split(':', 1)[1].strip()
+            response_text = await self._llm_query(llm_choice, prompt, max_tokens=80,
+                                                  system_prompt=_URL_JUDGE_SYSTEM_PROMPT, json_mode=True)
+            
+            data = self._parse_json_object(response_text)
+            if data is not None and 'selection' in data:
+                if data['selection'] is None:
+                    return {
+                        'success': False,
+                        'reason': 'LLM determined no URLs are suitable for this category',
+                        'confidence': 0.0
+                    }
+                try:
+                    selection_num = int(data['selection'])
+                except (TypeError, ValueError):
+                    selection_num = None
+                confidence = self._parse_confidence(str(data.get('confidence', '')), 0.5)
+                reason = str(data.get('reason', "Selection completed"))
+            else:
+                # Legacy line format, for answers that ignored the JSON instruction
+                if "NO_SUITABLE_URL" in response_text.upper():
+                    return {
+                        'success': False,
+                        'reason': 'LLM determined no URLs are suitable for this category',
+                        'confidence': 0.0
+                    }
+                fields = self._parse_response_fields(response_text)
+                selection_num = self._parse_first_int(fields['SELECTION']) if 'SELECTION' in fields else None
+                confidence = self._parse_confidence(fields.get('CONFIDENCE', ''), 0.5)
+                reason = fields.get('REASON', "Selection completed")
             
             if selection_num is None or selection_num < 1 or selection_num > len(urls):
                 return {
@@ -898,12 +1871,14 @@ class URLDiscoveryService:
             
             logger.info(f"🎯 Selected URL {selection_num} for {category} using {llm_choice} (confidence: {confidence:.2f})")
             
-            return {
+            selection = {
                 'success': True,
                 'url': selected_url,
                 'confidence': confidence,
                 'reason': reason
             }
+            self._cache_set(cache_key, selection, ttl=_LLM_CACHE_TTL)
+            return selection
             
         except Exception as e:
             logger.error(f"❌ LLM selection failed for {category}: {e}")
@@ -916,44 +1891,21 @@ class URLDiscoveryService:
     async def _discover_brand_domains(self, competitor_name: str, base_url: str) -> List[str]:
         """Use LLM to discover all official domains for a brand."""
         try:
-            from urllib.parse import urlparse
-            base_domain = urlparse(base_url).netloc.replace('www.', '')
+            base_domain = _url_host(base_url)
             
             # Check cache first (store for the session to avoid repeated calls)
             cache_key = f"brand_domains_{competitor_name.lower()}"
             if hasattr(self, '_domain_cache') and cache_key in self._domain_cache:
                 return self._domain_cache[cache_key]
             
-            prompt = f"""List the 3 MOST IMPORTANT official domains for {competitor_name}, ordered by importance and usage.
-
-Company: {competitor_name}
-Known domain: {base_domain}
-
-I need the TOP 3 most commonly used official domains for web search purposes. Prioritize:
-1. Main website domain (most traffic)
-2. Primary alternative domain (if exists)
-3. Most important subdomain or product domain
-
-Only return the 3 most important domains, ordered from most to least important. Do not include:
-- Social media platforms
-- Third-party review sites
-- Partner websites
-- Regional variations unless they're primary
-
-Format: Return exactly 3 domains, one per line, in order of importance.
-
-Example format:
-notion.so
-notion.com
-api.notion.com"""
+            prompt = _DOMAIN_DISCOVERY_PROMPT.format(competitor_name=competitor_name, base_domain=base_domain)
 
             # Try Cohere first
             domains = []
             if self.cohere_client:
                 try:
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: self.cohere_client.invoke(prompt)
-                    )
+                    async with self._llm_slot('cohere'):
+                        response = await self.cohere_client.ainvoke(prompt)
                     
                     if hasattr(response, 'content'):
                         response_text = response.content
@@ -969,23 +1921,15 @@ api.notion.com"""
                     logger.warning(f"⚠️ Cohere domain discovery failed: {e}")
             
             # Try OpenAI as fallback
-            if not domains and self.llm:
+            if not domains and self.openai_client:
                 try:
-                    from openai import OpenAI
-                    custom_client = OpenAI(
-                        api_key=self.openai_api_key,
-                        max_retries=1,
-                        timeout=15.0
-                    )
-                    
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: custom_client.chat.completions.create(
-                            model="gpt-4",
+                    async with self._llm_slot('openai'):
+                        response = await self.openai_client.chat.completions.create(
+                            model=self.openai_model,
                             messages=[{"role": "user", "content": prompt}],
                             temperature=0.1,
-                            max_tokens=200
+                            max_tokens=50
                         )
-                    )
                     
                     response_text = response.choices[0].message.content
                     domains = self._parse_domain_list(response_text, competitor_name)
@@ -1010,72 +1954,49 @@ api.notion.com"""
         except Exception as e:
             logger.warning(f"⚠️ Error discovering brand domains for {competitor_name}: {e}")
             # Fallback to just the base domain
-            from urllib.parse import urlparse
-            base_domain = urlparse(base_url).netloc.replace('www.', '')
+            base_domain = _url_host(base_url)
             return [base_domain]
 
     def _parse_domain_list(self, response_text: str, competitor_name: str) -> List[str]:
         """Parse domain list from LLM response, limited to top 3 most important."""
-        import re
-        
-        domains = []
-        lines = response_text.strip().split('\n')
-        
-        # Limit to first 3 valid domains (LLM should return them in order of importance)
-        max_domains = 3
-        
-        for line in lines:
-            if len(domains) >= max_domains:
-                break
-                
-            # Clean the line
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Remove common prefixes/suffixes from LLM responses
-            line = re.sub(r'^[-•*]\s*', '', line)  # Remove bullet points
-            line = re.sub(r'^\d+\.\s*', '', line)  # Remove numbers
-            line = line.replace('https://', '').replace('http://', '')
-            line = line.replace('www.', '')
-            line = line.split()[0] if line.split() else line  # Take first word
-            
-            # Validate it looks like a domain
-            if self._is_valid_domain_format(line):
-                # Additional validation for brand relevance
-                if self._is_reasonable_brand_domain(line, competitor_name):
-                    domains.append(line.lower())
-        
-        return domains  # Return up to 3 domains in order of importance
+        candidates = (self._clean_domain_line(line) for line in response_text.splitlines())
+        domains = (candidate.lower() for candidate in candidates
+                   if candidate
+                   and self._is_valid_domain_format(candidate)
+                   and self._is_reasonable_brand_domain(candidate, competitor_name))
+        # The LLM returns them in order of importance, so validation stops after the first 3 valid domains
+        return list(itertools.islice(domains, 3))
+
+    def _clean_domain_line(self, line: str) -> str:
+        """Strip list markers, scheme and www. from one line of an LLM domain list, keeping its first word."""
+        line = _LIST_BULLET_RE.sub('', line.strip())  # Remove bullet points
+        line = _LIST_NUMBER_RE.sub('', line)  # Remove numbers
+        line = line.removeprefix('https://').removeprefix('http://')
+        line = line.removeprefix('www.')
+        words = line.split(None, 1)  # Take first word
+        return words[0] if words else ''
 
     def _is_valid_domain_format(self, domain: str) -> bool:
         """Check if string looks like a valid domain."""
-        import re
-        
-        # Basic domain format validation
-        domain_pattern = r'^[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9]*\.([a-zA-Z]{2,}|[a-zA-Z]{2,}\.[a-zA-Z]{2,})$'
-        if not re.match(domain_pattern, domain):
+        # Cheap checks first: most junk lines in LLM answers fail these without reaching the regex
+        # Reasonable length
+        if len(domain) < 4 or len(domain) > 100:
             return False
         
         # Must have at least one dot
         if '.' not in domain:
             return False
         
-        # Reasonable length
-        if len(domain) < 4 or len(domain) > 100:
-            return False
-        
-        return True
+        # Basic domain format validation
+        return _DOMAIN_FORMAT_RE.match(domain) is not None
 
     def _is_reasonable_brand_domain(self, domain: str, competitor_name: str) -> bool:
         """Check if domain is reasonably related to the brand."""
-        import re
-        
         domain_lower = domain.lower()
         name_lower = competitor_name.lower()
         
         # Must contain some part of the brand name or be very short (like x.com)
-        name_parts = re.split(r'[\s\-_]', name_lower)
+        name_parts = _NAME_SEPARATOR_RE.split(name_lower)
         main_name_part = max(name_parts, key=len) if name_parts else name_lower
         
         # Check if domain contains the main brand name
@@ -1088,108 +2009,86 @@ api.notion.com"""
         
         return False
 
-    def _is_same_domain(self, url: str, base_url: str, official_domains: List[str] = None) -> bool:
-        """Check if URL belongs to the same domain as base_url (including subdomains and related brand domains)."""
-        try:
-            from urllib.parse import urlparse
-            
-            # Parse both URLs
-            url_parsed = urlparse(url.lower())
-            base_parsed = urlparse(base_url.lower())
-            
-            # Extract domain parts
-            url_domain = url_parsed.netloc
-            base_domain = base_parsed.netloc
-            
-            # Remove 'www.' prefix for comparison
-            url_domain = url_domain.replace('www.', '')
-            base_domain = base_domain.replace('www.', '')
-            
-            # Check if it's the exact same domain
-            if url_domain == base_domain:
-                return True
-            
-            # Check if url_domain is a subdomain of base_domain
-            if url_domain.endswith('.' + base_domain):
-                return True
-            
-            # Check if base_domain is a subdomain of url_domain (reverse case)
-            if base_domain.endswith('.' + url_domain):
-                return True
-            
-            # NEW: Check for related brand domains using LLM-discovered official domains
-            if official_domains and self._is_same_brand_domain(url_domain, base_domain, official_domains):
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Error comparing domains for {url} vs {base_url}: {e}")
-            return False
+    def _build_domain_index(self, base_url: str, official_domains: List[str]) -> Tuple[frozenset, frozenset]:
+        """
+        Normalize the base URL's domain and the official brand domains once per discovery run.
+        
+        Returns the domains and all of their parent domains (cursor.com for app.cursor.com),
+        so _is_same_domain only needs set lookups.
+        """
+        domains = {_url_host(base_url)}
+        domains.update(domain.lower().removeprefix('www.') for domain in official_domains or ())
+        domains.discard('')
+        
+        parents = set()
+        for domain in domains:
+            labels = domain.split('.')
+            parents.update('.'.join(labels[i:]) for i in range(1, len(labels)))
+        return frozenset(domains), frozenset(parents)
 
-    def _is_same_brand_domain(self, url_domain: str, base_domain: str, official_domains: List[str]) -> bool:
-        """Check if URL domain matches any of the discovered official brand domains."""
-        url_domain_clean = url_domain.replace('www.', '').lower()
+    def _is_same_domain(self, url: str, domain_index: Tuple[frozenset, frozenset]) -> bool:
+        """
+        Check if URL belongs to the base domain or an LLM-discovered official brand domain.
         
-        for official_domain in official_domains:
-            official_domain_clean = official_domain.replace('www.', '').lower()
-            
-            # Direct match
-            if url_domain_clean == official_domain_clean:
-                return True
-            
-            # Subdomain match (e.g., app.cursor.com matches cursor.com)
-            if url_domain_clean.endswith('.' + official_domain_clean):
-                return True
-                
-            # Reverse subdomain match (e.g., cursor.com matches app.cursor.com)
-            if official_domain_clean.endswith('.' + url_domain_clean):
-                return True
+        Subdomains match (app.cursor.com for cursor.com) and so do parent domains
+        (cursor.com for app.cursor.com).
+        """
+        url_domain = _url_host(url)
+        if not url_domain:
+            return False
         
-        return False
+        domains, parents = domain_index
+        if url_domain in domains or url_domain in parents:
+            return True
+        
+        labels = url_domain.split('.')
+        return any('.'.join(labels[i:]) in domains for i in range(1, len(labels)))
 
-    def _generate_targeted_search_queries(self, competitor_name: str, official_domains: List[str], categories: List[str], depth: str) -> List[str]:
-        """Generate targeted search queries using the discovered top 3 domains."""
-        queries = []
+    def _generate_targeted_search_queries(self, competitor_name: str, official_domains: List[str],
+                                          categories: List[str], depth: str) -> Dict[str, List[str]]:
+        """
+        Generate targeted search queries using the discovered top 3 domains.
         
+        Returns the queries grouped by category, without duplicates and capped at
+        _MAX_QUERIES_PER_CATEGORY per category.
+        """
         logger.info(f"🔍 Generating targeted searches for {len(official_domains)} domains and {len(categories)} categories...")
         
-        # For each category, create searches targeting the discovered domains
+        # example.com and www.example.com would otherwise produce the same site: query twice
+        domains = list(dict.fromkeys(domain.lower().removeprefix('www.') for domain in official_domains))
+        
+        queries_by_category = {}
         for category in categories:
+            queries = []
+            seen = set()
+            
+            def add_query(query: str):
+                key = query.lower()
+                if key not in seen and len(queries) < _MAX_QUERIES_PER_CATEGORY:
+                    seen.add(key)
+                    queries.append(query)
+            
             # Generic search query (not domain-specific)
-            queries.append(f"{competitor_name} {category}")
+            add_query(f"{competitor_name} {category}")
             
-            # Domain-specific queries for each discovered domain
-            for domain in official_domains:
-                if depth != "quick":
-                    # Site-specific search for this domain
-                    queries.append(f"site:{domain} {category}")
-                    
-                    # Add comprehensive variations for certain categories
-                    if depth == "comprehensive":
-                        category_variations = {
-                            'pricing': ['price', 'cost', 'plans', 'subscription'],
-                            'features': ['product', 'capabilities', 'functionality'],
-                            'about': ['company', 'team', 'story'],
-                            'contact': ['support', 'help', 'customer-service'],
-                            'blog': ['news', 'articles', 'insights'],
-                            'careers': ['jobs', 'hiring', 'work'],
-                            'docs': ['documentation', 'api', 'developer'],
-                            'social': ['twitter', 'linkedin', 'facebook']
-                        }
-                        
-                        variations = category_variations.get(category, [])
-                        for variation in variations[:1]:  # Limit to 1 variation per category per domain
-                            queries.append(f"site:{domain} {variation}")
-        
-        # If quick mode, limit to primary domain only
-        if depth == "quick":
-            primary_domain = official_domains[0] if official_domains else None
-            if primary_domain:
-                queries = [q for q in queries if 'site:' not in q or primary_domain in q]
-        
-        logger.info(f"📝 Generated {len(queries)} targeted search queries")
-        return queries
+            # Quick mode only runs the generic query
+            if depth != "quick":
+                # Limit to 1 variation per category per domain in comprehensive mode
+                variations = _CATEGORY_VARIATIONS.get(_category_slug(category), ())[:1] if depth == "comprehensive" else ()
+                
+                # Domain-specific queries for each discovered domain come first, so every official
+                # domain is covered before variations take up the remaining slots
+                for domain in domains:
+                    add_query(f"site:{domain} {category}")
+                for domain in domains:
+                    for variation in variations:
+                        add_query(f"site:{domain} {variation}")
+            
+            queries_by_category[category] = queries
+        
+        total = sum(len(queries) for queries in queries_by_category.values())
+        logger.info(f"📝 Generated {total} targeted search queries")
+        return queries_by_category
 
     def get_available_search_backends(self) -> List[str]:
         """Get list of available search backends."""
@@ -1212,44 +2111,132 @@ api.notion.com"""
         logger.warning("📝 get_predefined_categories() called but categories are now dynamic")
         return {}
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the title and search response cache."""
+        return {
+            **self._cache_stats,
+            'size': len(self._response_cache),
+            'max_size': self._response_cache_max_size
+        }
+
     def get_ai_status(self) -> Dict[str, Any]:
         """Get information about available AI services."""
         return {
-            'openai_available': bool(self.llm),
+            'openai_available': bool(self.openai_client),
             'cohere_available': bool(self.cohere_client),
             'fallback_method': 'pattern_matching',
             'categories_source': 'dynamic (from user/database)'
         }
 
-    async def _cohere_query(self, prompt: str) -> str:
+    def _llm_cache_key(self, provider: str, prompt: str, system_prompt: Optional[str] = None) -> Tuple:
+        """Cache key for an LLM response; prompts are hashed to keep cache keys small."""
+        digest = hashlib.sha256(prompt.encode('utf-8'))
+        if system_prompt:
+            digest.update(b'\0' + system_prompt.encode('utf-8'))
+        return ('llm', provider, digest.hexdigest())
+
+    def _candidate_set_cache_key(self, kind: str, llm_choice: str, competitor_name: str, category: str,
+                                 urls: List[Dict[str, Any]]) -> Tuple:
+        """
+        Cache key for a category ranking or selection that ignores the order of the candidates.
+        
+        Search backends often return the same pages in a different order, which changes
+        the prompt (and misses the prompt cache) without changing the answer.
+        """
+        candidates = frozenset(self._normalize_url(url_data.get('url', '')) for url_data in urls)
+        return (kind, llm_choice, competitor_name.strip().lower(), category.lower(), candidates)
+
+    async def _llm_query(self, llm_choice: str, prompt: str, max_tokens: int = 200,
+                         system_prompt: Optional[str] = None, json_mode: bool = False) -> str:
+        """
+        Execute a prompt on the chosen LLM ("cohere" or "openai"), using Cohere when OpenAI is rate limited.
+        
+        json_mode asks OpenAI for a guaranteed JSON object (the prompt must mention JSON); Cohere
+        answers are still parsed leniently by _parse_json_object.
+        """
+        if llm_choice == "cohere":
+            return await self._cohere_query(prompt, system_prompt)
+        try:
+            return await self._openai_query(prompt, max_tokens=max_tokens, system_prompt=system_prompt,
+                                            json_mode=json_mode)
+        except RateLimitError as e:
+            # Covers both 429 throttling and exhausted quota (insufficient_quota)
+            if not self.cohere_client:
+                raise
+            logger.warning(f"⚠️ OpenAI rate limited or out of quota, falling back to Cohere: {e}")
+            return await self._cohere_query(prompt, system_prompt)
+
+    async def _cohere_query(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Execute a Cohere query."""
         if not hasattr(self, 'cohere_client') or not self.cohere_client:
             raise Exception("Cohere client not available")
         
-        response = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: self.cohere_client.invoke(prompt)
-        )
+        messages = [SystemMessage(content=system_prompt), HumanMessage(content=prompt)] if system_prompt else prompt
         
-        if hasattr(response, 'content'):
-            return response.content
-        else:
+        async def invoke() -> str:
+            async with self._llm_slot('cohere'):
+                response = await self.cohere_client.ainvoke(messages)
+            
+            if hasattr(response, 'content'):
+                return response.content
             return str(response)
+        
+        return await self._cached_llm_call(self._llm_cache_key('cohere', prompt, system_prompt), invoke)
 
-    async def _openai_query(self, prompt: str) -> str:
-        """Execute an OpenAI query."""
-        if not self.openai_api_key:
+    async def _openai_query(self, prompt: str, max_tokens: int = 200, system_prompt: Optional[str] = None,
+                            json_mode: bool = False) -> str:
+        """Execute an OpenAI query; max_tokens should fit the expected answer to bound decode time."""
+        if not self.openai_client:
             raise Exception("OpenAI API key not available")
         
-        from openai import OpenAI
-        client = OpenAI(api_key=self.openai_api_key, max_retries=1, timeout=15.0)
-        
-        response = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=200
-            )
-        )
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        
+        # Constrained JSON output never needs the lenient fallback parse or per-category retries
+        extra_args = {'response_format': {"type": "json_object"}} if json_mode else {}
+        
+        async def invoke() -> str:
+            async with self._llm_slot('openai'):
+                response = await self.openai_client.chat.completions.create(
+                    model=self.openai_model,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    **extra_args
+                )
+            choice = response.choices[0]
+            if choice.finish_reason == 'length':
+                logger.warning(f"✂️ OpenAI answer hit max_tokens={max_tokens} and was cut off")
+                if json_mode:
+                    # Cut-off JSON never parses; failing here keeps it out of the cache and tells the caller why
+                    raise Exception(f"OpenAI answer cut off at max_tokens={max_tokens}")
+            return choice.message.content.strip()
+        
+        return await self._cached_llm_call(self._llm_cache_key(self.openai_model, prompt, system_prompt), invoke)
+
+    async def _cached_llm_call(self, cache_key: Tuple, invoke: Callable[[], Awaitable[str]]) -> str:
+        """
+        Return the cached answer for an LLM prompt, or run invoke() once and cache its answer.
         
-        return response.choices[0].message.content.strip() 
\ No newline at end of file
+        Concurrent calls for the same prompt share the in-flight request instead of each
+        paying for their own. Every caller, including the one that started the request, awaits it
+        through asyncio.shield, so cancelling one caller never cancels it for the others.
+        """
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        task = self._inflight_llm_calls.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(invoke())
+            self._inflight_llm_calls[cache_key] = task
+            
+            def finish(done: asyncio.Future):
+                # Runs even when every caller was cancelled, so a finished answer is still cached
+                del self._inflight_llm_calls[cache_key]
+                if not done.cancelled() and done.exception() is None:
+                    self._cache_set(cache_key, done.result(), ttl=_LLM_CACHE_TTL)
+            
+            task.add_done_callback(finish)
+        return await asyncio.shield(task)
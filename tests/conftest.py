@@ -0,0 +1,9 @@
+"""
+Shared pytest setup: make the Lambda source tree importable the way the handlers see it.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
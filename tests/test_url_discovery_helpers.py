@@ -0,0 +1,214 @@
+"""
+Tests for the synchronous helpers of URLDiscoveryService: local keyword scoring, path pattern
+matching, URL normalization and LLM response parsing.
+"""
+
+import pytest
+
+from services.url_discovery import URLDiscoveryService
+
+
+@pytest.fixture
+def service():
+    # No API keys: only the sitemap fallback is configured and nothing touches the network
+    return URLDiscoveryService()
+
+
+def _result(url, title='', snippet=''):
+    return {'url': url, 'title': title, 'snippet': snippet}
+
+
+# Local relevance scoring
+
+@pytest.mark.parametrize('category, url', [
+    ('careers', 'https://example.com/networking'),
+    ('careers', 'https://example.com/framework'),
+    ('careers', 'https://example.com/how-it-works'),
+    ('docs', 'https://example.com/capital'),
+    ('docs', 'https://example.com/rapid'),
+    ('about', 'https://example.com/history'),
+    ('about', 'https://example.com/steam'),
+])
+def test_local_relevance_score_ignores_keywords_inside_other_words(service, category, url):
+    assert service._local_relevance_score(_result(url), category) == 0.0
+
+
+@pytest.mark.parametrize('category, url', [
+    ('careers', 'https://example.com/careers'),
+    ('careers', 'https://example.com/en/work'),
+    ('about', 'https://example.com/about-us'),
+    ('docs', 'https://example.com/developer_api'),
+    ('pricing', 'https://example.com/pricing.html'),
+    ('case studies', 'https://example.com/case-studies'),
+])
+def test_local_relevance_score_matches_whole_path_segments_and_words(service, category, url):
+    assert service._local_relevance_score(_result(url), category) == 3.0
+
+
+def test_local_relevance_score_weights_title_and_snippet_by_whole_words(service):
+    result = _result('https://example.com/company', title='Meet the Team', snippet='The history of steam engines')
+    assert service._local_relevance_score(result, 'about') == 5.0
+    
+    result = _result('https://example.com/blog/1', title='Steam history', snippet='Our story so far')
+    assert service._local_relevance_score(result, 'about') == 1.0
+
+
+def test_local_select_url_takes_a_clear_path_winner(service):
+    urls = [
+        _result('https://example.com/how-it-works', title='How it works'),
+        _result('https://example.com/careers', title='Careers'),
+        _result('https://example.com/networking'),
+    ]
+    assert service._local_select_url(urls, 'careers') is urls[1]
+
+
+def test_local_select_url_leaves_substring_only_matches_to_the_llm(service):
+    urls = [
+        _result('https://example.com/networking'),
+        _result('https://example.com/framework'),
+        _result('https://example.com/how-it-works'),
+    ]
+    assert service._local_select_url(urls, 'careers') is None
+
+
+def test_local_select_url_leaves_ties_to_the_llm(service):
+    urls = [
+        _result('https://example.com/pricing'),
+        _result('https://example.com/en/plans'),
+    ]
+    assert service._local_select_url(urls, 'pricing') is None
+
+
+def test_local_select_url_needs_a_path_match(service):
+    urls = [_result('https://example.com/resources', title='Pricing and plans', snippet='See our pricing')]
+    assert service._local_select_url(urls, 'pricing') is None
+
+
+# Path pattern matching
+
+@pytest.mark.parametrize('url, category', [
+    ('https://example.com/pricing', 'pricing'),
+    ('https://example.com/pricing/', 'pricing'),
+    ('https://example.com/Case-Studies', 'Case Studies'),
+])
+def test_pattern_match_url_exact_slug(service, url, category):
+    assert service._pattern_match_url([_result(url)], category) == (_result(url), 0.9)
+
+
+@pytest.mark.parametrize('url, category', [
+    ('https://example.com/en/pricing', 'pricing'),
+    ('https://example.com/product/plans', 'pricing'),
+    ('https://example.com/company/jobs', 'careers'),
+    ('https://example.com/en/about-us', 'about'),
+])
+def test_pattern_match_url_final_segment_slug_or_alias(service, url, category):
+    assert service._pattern_match_url([_result(url)], category) == (_result(url), 0.8)
+
+
+@pytest.mark.parametrize('url, category', [
+    ('https://example.com/how-it-works/work', 'careers'),
+    ('https://example.com/reference/api', 'docs'),
+    ('https://example.com/our/story', 'about'),
+    ('https://example.com/help', 'contact'),
+    ('https://example.com/pricing-calculator', 'pricing'),
+])
+def test_pattern_match_url_leaves_loose_variations_to_ranking(service, url, category):
+    assert service._pattern_match_url([_result(url)], category) == (None, 0.0)
+
+
+def test_pattern_match_url_prefers_exact_slug_over_segment_match(service):
+    urls = [_result('https://example.com/en/pricing'), _result('https://example.com/pricing')]
+    assert service._pattern_match_url(urls, 'pricing') == (urls[1], 0.9)
+
+
+# URL normalization and deduplication
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://WWW.Example.com:443/Pricing/?b=2&a=1#plans', 'https://example.com/Pricing?a=1&b=2'),
+    ('http://example.com:80/', 'http://example.com'),
+    ('http://example.com:8080/docs', 'http://example.com:8080/docs'),
+    ('https://m.example.com/blog', 'https://example.com/blog'),
+    ('https://www.com/', 'https://www.com'),
+    ('https://example.com/p?utm_source=x&UTM_MEDIUM=y&gclid=1&fbclid=2&ref_src=tw&_ga=3&id=5',
+     'https://example.com/p?id=5'),
+])
+def test_normalize_url(service, url, expected):
+    assert service._normalize_url(url) == expected
+
+
+def test_normalize_url_keeps_ref_parameter(service):
+    assert service._normalize_url('https://example.com/docs?ref=v2') == 'https://example.com/docs?ref=v2'
+    assert service._normalize_url('https://example.com/docs?ref=v1') != service._normalize_url('https://example.com/docs?ref=v2')
+
+
+def test_deduplicate_results_keeps_first_occurrence(service):
+    results = [
+        _result('https://www.example.com/pricing/', title='first'),
+        _result('https://example.com/pricing?utm_campaign=ads', title='second'),
+        _result('https://example.com/features'),
+        _result('https://example.com/docs?ref=v1'),
+        _result('https://example.com/docs?ref=v2'),
+    ]
+    assert list(service._deduplicate_results(results)) == [results[0], results[2], results[3], results[4]]
+
+
+def test_deduplicate_results_shares_seen_urls_across_calls(service):
+    seen_urls = set()
+    assert len(list(service._deduplicate_results([_result('https://example.com/blog')], seen_urls))) == 1
+    assert list(service._deduplicate_results([_result('https://www.example.com/blog/')], seen_urls)) == []
+    assert seen_urls == {'https://example.com/blog'}
+
+
+# LLM response parsing
+
+@pytest.mark.parametrize('text, expected', [
+    (' [2] pricing', 2),
+    ('12, 3, 4', 12),
+    ('URL7', 7),
+    ('none', None),
+    ('', None),
+])
+def test_parse_first_int(service, text, expected):
+    assert service._parse_first_int(text) == expected
+
+
+def test_parse_response_fields_collects_key_value_lines(service):
+    response = "SELECTED_URL: 2\n  CONFIDENCE: 0.8\nREASONING: clear pricing page\nnote: ignored\nCONFIDENCE: 0.9"
+    assert service._parse_response_fields(response) == {
+        'SELECTED_URL': '2',
+        'CONFIDENCE': '0.9',
+        'REASONING': 'clear pricing page',
+    }
+
+
+def test_parse_response_fields_without_fields(service):
+    assert service._parse_response_fields('I could not find a matching page.') == {}
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('0.85', 0.85),
+    (' 1 ', 1.0),
+    ('about 0.7 overall', 0.7),
+    ('.5', 0.5),
+    ('high', 0.4),
+    ('nan', 0.4),
+    ('inf', 0.4),
+    ('1.5', 1.0),
+    ('-0.2', 0.0),
+    ('85', 1.0),
+])
+def test_parse_confidence(service, text, expected):
+    assert service._parse_confidence(text, 0.4) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"pricing": {"selected": 2}}', {'pricing': {'selected': 2}}),
+    ('```json\n{"a": 1}\n```', {'a': 1}),
+    ('Here you go: {"a": [1, 2]} Hope this helps.', {'a': [1, 2]}),
+    ('no json here', None),
+    ('["pricing", "features"]', None),
+    ('{not json}', None),
+    ('} backwards {', None),
+])
+def test_parse_json_object(service, text, expected):
+    assert service._parse_json_object(text) == expected